@@ -0,0 +1,94 @@
+"""
+Throughput and latency benchmark of the FATd clients against a local MockFATd.
+
+Run it from the repository root:
+
+    python -m benchmarks.client_benchmark --transactions 20000 --latency 0.005
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fat import FATd
+from fat.metrics import Metrics
+from fat.testing import MockFATd, SyntheticToken
+
+try:
+    from fat import AsyncFATd
+    import aiohttp  # noqa: F401
+except ImportError:  # pragma: no cover
+    AsyncFATd = None
+
+
+def report(name, calls, elapsed, metrics=None):
+    line = "{:<28} {:>8} calls {:>8.2f} s {:>10.1f} calls/s".format(name, calls, elapsed, calls / elapsed)
+    if metrics is not None:
+        stats = [s for s in metrics.snapshot().values()]
+        if stats:
+            line += "   p50 <= {:.4f} s  p99 <= {:.4f} s".format(
+                max(s["p50"] for s in stats), max(s["p99"] for s in stats)
+            )
+    print(line)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def run(args):
+    token = SyntheticToken(num_addresses=args.addresses, num_transactions=args.transactions, seed=args.seed)
+    addresses = [token.addresses[i % len(token.addresses)] for i in range(args.requests)]
+
+    with MockFATd([token], latency=args.latency, seed=args.seed) as server:
+        print("MockFATd at {} with {} addresses, {} transactions, {} s latency".format(
+            server.url, args.addresses, args.transactions, args.latency))
+
+        metrics = Metrics()
+        fatd = FATd(host=server.url, observers=[metrics], coalesce=False, pool_maxsize=args.concurrency)
+        elapsed = timed(lambda: [fatd.get_balance(a, chain_id=token.chain_id) for a in addresses])
+        report("get_balance serial", args.requests, elapsed, metrics)
+
+        metrics.reset()
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            elapsed = timed(lambda: list(executor.map(
+                lambda a: fatd.get_balance(a, chain_id=token.chain_id), addresses)))
+        report("get_balance {} threads".format(args.concurrency), args.requests, elapsed, metrics)
+
+        metrics.reset()
+        calls = [("get-balance", {"chainid": token.chain_id, "address": a}) for a in addresses]
+        elapsed = timed(lambda: fatd.call_many(calls, batch_size=args.batch_size))
+        report("get_balance batch {}".format(args.batch_size), args.requests, elapsed, metrics)
+
+        if AsyncFATd is not None:
+            async def gather():
+                async with AsyncFATd(host=server.url, observers=[metrics], max_connections=args.concurrency) as afatd:
+                    await asyncio.gather(*[afatd.get_balance(a, chain_id=token.chain_id) for a in addresses])
+
+            metrics.reset()
+            elapsed = timed(lambda: asyncio.run(gather()))
+            report("get_balance async", args.requests, elapsed, metrics)
+
+        for workers in (1, args.concurrency):
+            metrics.reset()
+            elapsed = timed(lambda: fatd.get_all_transactions(chain_id=token.chain_id, limit=args.page_size,
+                                                              workers=workers))
+            report("full history {} workers".format(workers), len(token.transactions), elapsed, metrics)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=1000, help="addresses holding the synthetic token")
+    parser.add_argument("--transactions", type=int, default=10000, help="transactions in the synthetic history")
+    parser.add_argument("--requests", type=int, default=2000, help="get_balance calls per scenario")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds added to every HTTP request")
+    parser.add_argument("--concurrency", type=int, default=16, help="threads, connections and page workers")
+    parser.add_argument("--batch-size", type=int, default=100, help="calls per JSON-RPC batch")
+    parser.add_argument("--page-size", type=int, default=100, help="transactions per page")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic dataset")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
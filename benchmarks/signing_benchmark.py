@@ -0,0 +1,82 @@
+"""
+Signing throughput of FAT-0 transactions, before and after the keyring cache, and with sign_many.
+
+Run it from the repository root:
+
+    python -m benchmarks.signing_benchmark --transactions 2000 --inputs 2
+"""
+import argparse
+import hashlib
+import time
+from factom_keys.fct import FactoidPrivateKey
+from fat.fat0 import Transaction
+from fat.signing import sign_many
+
+
+def uncached_sign(tx):
+    # Transaction.sign as it was before signers were cached: the RCD is derived from the key for every signature.
+    ext_ids = [tx._timestamp.encode()]
+    content = tx.build_content()
+    chain_id = bytes.fromhex(tx.chain_id)
+    for i, signer in enumerate(tx.signers):
+        message = bytearray()
+        message.extend(str(i).encode())
+        message.extend(tx._timestamp.encode())
+        message.extend(chain_id)
+        message.extend(content)
+        message_hash = hashlib.sha512(message).digest()
+        if tx.is_mint():
+            ext_ids.append(b"\x01" + signer.get_public_key().key_bytes)
+        else:
+            ext_ids.append(b"\x01" + signer.get_factoid_address().key_bytes)
+        ext_ids.append(signer.sign(message_hash))
+    tx._ext_ids = ext_ids
+    tx._content = content
+
+
+def make_transactions(count, inputs, keys):
+    chain_id = "145d5207a1ca2978e2a1cb43c97d538cd516d65cd5d14579549664bfecd80296"
+    addresses = [key.get_factoid_address() for key in keys]
+    transactions = []
+    for i in range(count):
+        tx = Transaction(chain_id=chain_id)
+        for key, address in zip(keys[:inputs], addresses):
+            tx.add_input(address, i + 1)
+            tx.add_signer(key)
+        tx.add_output(addresses[-1], (i + 1) * inputs)
+        transactions.append(tx)
+    return transactions
+
+
+def report(name, signatures, elapsed):
+    print("{:<28} {:>8} signatures {:>8.2f} s {:>10.1f} signatures/s".format(
+        name, signatures, elapsed, signatures / elapsed))
+
+
+def run(args):
+    keys = [FactoidPrivateKey(seed_bytes=bytes([i + 1]) * 32) for i in range(args.inputs + 1)]
+    signatures = args.transactions * args.inputs
+
+    scenarios = [
+        ("uncached sign()", lambda txs: [uncached_sign(tx) for tx in txs]),
+        ("sign()", lambda txs: [tx.sign() for tx in txs]),
+        ("sign_many, 1 process", lambda txs: sign_many(txs, processes=1)),
+        ("sign_many, all CPUs", lambda txs: sign_many(txs, chunksize=args.chunksize)),
+    ]
+    for name, sign in scenarios:
+        transactions = make_transactions(args.transactions, args.inputs, keys)
+        started = time.perf_counter()
+        sign(transactions)
+        report(name, signatures, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=2000, help="transactions signed per scenario")
+    parser.add_argument("--inputs", type=int, default=2, help="inputs, and so signatures, per transaction")
+    parser.add_argument("--chunksize", type=int, default=64, help="transactions sent to a worker at a time")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
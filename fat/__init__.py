@@ -1 +1,3 @@
 from .client import FATd
+from .async_client import AsyncFATd
+from .pool import FATdPool
@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import List, Union
+from factom_keys.fct import FactoidAddress
+from .errors import InvalidAddresses, InvalidParam
+
+# The number of address strings whose validation is remembered.
+ADDRESS_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _canonical_string(address: str) -> str:
+    return FactoidAddress(address_string=address).to_string()
+
+
+def canonical_address(address: Union[FactoidAddress, str]) -> str:
+    """
+    Validate a Factoid address and convert it to a str.
+
+    Strings are decoded and checksummed once; repeated addresses are answered from a bounded LRU cache.
+
+    :param address: a Factoid address as a str or a FactoidAddress object
+    :return: the address as a str
+    """
+
+    if isinstance(address, str):
+        return _canonical_string(address)
+    if isinstance(address, FactoidAddress):
+        return address.to_string()
+    raise InvalidParam("Invalid address!")
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _rcd_hash_of_string(address: str) -> bytes:
+    return FactoidAddress(address_string=address).rcd_hash
+
+
+def rcd_hash(address: Union[FactoidAddress, str]) -> bytes:
+    """
+    Validate a Factoid address and get its 32 byte RCD hash, the body of the address.
+
+    :param address: a Factoid address as a str or a FactoidAddress object
+    :return: the RCD hash
+    """
+
+    if isinstance(address, str):
+        return _rcd_hash_of_string(address)
+    if isinstance(address, FactoidAddress):
+        return bytes(address.rcd_hash)
+    raise InvalidParam("Invalid address!")
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def address_from_rcd_hash(rcd_hash: bytes) -> str:
+    """
+    :param rcd_hash: a 32 byte RCD hash
+    :return: the Factoid address of the RCD hash as a str
+    """
+
+    return FactoidAddress(rcd_hash=rcd_hash).to_string()
+
+
+def validate_addresses(addresses) -> List[str]:
+    """
+    Validate many Factoid addresses at once.
+
+    :param addresses: an iterable of Factoid addresses as str or FactoidAddress objects
+    :return: the addresses as str, in order
+    :raises InvalidAddresses: listing every invalid address, if there are any
+    """
+
+    valid = []
+    invalid = []
+    for address in addresses:
+        try:
+            valid.append(canonical_address(address))
+        except ValueError:
+            invalid.append(address)
+    if invalid:
+        raise InvalidAddresses(invalid)
+    return valid
+
+
+__all__ = ["canonical_address", "rcd_hash", "address_from_rcd_hash", "validate_addresses"]
@@ -0,0 +1,384 @@
+import asyncio
+import ssl
+import time
+from collections import deque
+from .cache import cache_key, SYNC_HEIGHT_METHODS
+from .client import Batch, FATd, SubmitResult, WRITE_METHODS
+from .errors import (build_error, DuplicateTransaction, FATdAPIError, InvalidParam, TokenSyncing,
+                     TransactionNotFound)
+from .session import AdaptiveWindow
+from .singleflight import AsyncSingleFlight
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncFATd(FATd):
+    transport_errors = (aiohttp.ClientError, asyncio.TimeoutError) if aiohttp is not None else ()
+
+    def __init__(
+        self,
+        ec_address=None,
+        fct_address=None,
+        host=None,
+        username=None,
+        password=None,
+        certfile=None,
+        max_connections=100,
+        max_concurrency=None,
+        **kwargs
+    ):
+        """
+        Instantiate a new asyncio API client.
+
+        Exposes the same RPC methods as FATd, but every method returns a coroutine.
+        Args:
+            max_connections (int): Size of the connection pool to the node.
+            max_concurrency (int): Maximum number of requests in flight at once.
+                Requests beyond the limit wait for a free slot. Defaults to
+                max_connections.
+            See FATd for the remaining arguments.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncFATd requires aiohttp. Install it with `pip install fat[async]`.")
+
+        super().__init__(ec_address, fct_address, host, username, password, certfile, **kwargs)
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency or max_connections
+        self._http = None
+        self._semaphore = None
+        if self.single_flight is not None:
+            self.single_flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_http(self):
+        # Created lazily so that the pool and semaphore belong to the running event loop.
+        if self._http is None or self._http.closed:
+            ssl_context = None
+            if isinstance(self.session.verify, str):
+                ssl_context = ssl.create_default_context(cafile=self.session.verify)
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections, ssl=ssl_context, force_close=not self.session.keep_alive
+            )
+            self._http = aiohttp.ClientSession(
+                connector=connector, headers=dict(self.session.headers), timeout=self._client_timeout()
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._http
+
+    def _client_timeout(self):
+        timeout = self.session.timeout
+        if timeout is None:
+            return aiohttp.ClientTimeout(total=None)
+        if isinstance(timeout, tuple):
+            return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        return aiohttp.ClientTimeout(total=timeout)
+
+    async def close(self):
+        """Close the connection pool."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def _post(self, method, data, raw=False, retry=True):
+        attempt = 0
+        while True:
+            try:
+                return await self._post_once(method, data, raw)
+            except (FATdAPIError,) + self.transport_errors as error:
+                if not (retry and self.retry_policy and self.retry_policy.should_retry(method, error, attempt)):
+                    raise
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+
+    async def _post_once(self, method, data, raw=False):
+        payload = self.codec.dumps(data)
+        content = b""
+        started = time.perf_counter()
+        try:
+            http = self._get_http()
+            async with self._semaphore:
+                async with http.post(self.url, data=payload) as resp:
+                    content = await resp.read()
+            if resp.status >= 400:
+                raise build_error(self.codec.loads(content).get("error", {}), response=resp)
+            body = content if raw else self.codec.loads(content)
+        except Exception as error:
+            if self.observers:
+                self._record(method, started, len(payload), len(content), error)
+            raise
+
+        if self.observers:
+            self._record(method, started, len(payload), len(content))
+        return body
+
+    async def _request(self, method, params=None, request_id: int = 0, raw: bool = False):
+        if method in SYNC_HEIGHT_METHODS:
+            await self._refresh_sync_height()
+        cache, key = self._cache_for(method, params)
+        if cache is not None:
+            response = cache.get(key)
+            if response is not None:
+                return self.codec.dumps(response) if raw else response
+
+        data = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params:
+            data["params"] = params
+
+        if self.single_flight is not None and method not in WRITE_METHODS:
+            flight_key = (raw, cache_key(method, params))
+            response = await self.single_flight.do(flight_key, lambda: self._post(method, data, raw))
+        else:
+            response = await self._post(method, data, raw)
+
+        if cache is not None:
+            body = self.codec.loads(response) if raw else response
+            if "result" in body:
+                cache.set(key, body)
+        return response
+
+    async def _refresh_sync_height(self):
+        if self.sync_cache is None or not self.sync_cache.claim_check():
+            return
+        height = None
+        try:
+            height = (await self.get_sync_status())["result"]["syncheight"]
+        except (FATdAPIError,) + self.transport_errors:
+            pass
+        finally:
+            if height is None:
+                self.sync_cache.check_failed()
+            else:
+                self.sync_cache.update_height(height)
+
+    async def _batch_request(self, calls, batch_size=None):
+        """
+        Send several calls as JSON-RPC 2.0 batch requests. The chunks are sent concurrently.
+
+        :param calls: a list of (method, params) tuples
+        :param batch_size: the maximum number of calls per HTTP request
+        :return: a list of JSON responses in the same order as calls
+        """
+
+        batch_size = batch_size or self.batch_size
+        if batch_size < 1:
+            raise InvalidParam("Batch size must be at least 1!")
+
+        if any(method in SYNC_HEIGHT_METHODS for method, _ in calls):
+            await self._refresh_sync_height()
+        responses, entries = self._cached_responses(calls)
+        misses = [i for i, response in enumerate(responses) if response is None]
+        chunks = [misses[start:start + batch_size] for start in range(0, len(misses), batch_size)]
+        results = await asyncio.gather(*[self._send_batch([calls[i] for i in chunk]) for chunk in chunks])
+        for chunk, chunk_responses in zip(chunks, results):
+            for i, response in zip(chunk, chunk_responses):
+                responses[i] = response
+                cache, key = entries[i]
+                if cache is not None and "result" in response:
+                    cache.set(key, response)
+
+        return responses
+
+    async def _send_batch(self, calls):
+        body = await self._post("batch", FATd._batch_payload(calls), retry=self._may_retry_batch(calls))
+        return FATd._batch_responses(len(calls), body)
+
+    async def call_many(self, calls, batch_size=None):
+        """
+        Send many RPC calls, packed into as few HTTP requests as possible.
+
+        :param calls: an iterable of (method, params) tuples
+        :param batch_size: the maximum number of calls per HTTP request; defaults to BaseAPI.batch_size
+        :return: a list of JSON responses in the same order as calls
+        """
+
+        responses = await self._batch_request(list(calls), batch_size)
+        for response in responses:
+            if "error" in response:
+                raise build_error(response["error"])
+        return responses
+
+    def iter_transactions(self, chain_id=None, token_id=None, issuer_id=None, nf_token_id=None, addresses=None,
+                          to_from=None, entry_hash=None, limit=None, order=None, workers=1):
+        """
+        Iterate over all transactions matching the query with `async for`, fetching pages lazily.
+
+        :param limit: the number of transactions requested per page; defaults to BaseAPI.page_size
+        :param workers: the number of pages fetched concurrently
+        :return: an async generator of transaction dicts
+        """
+
+        limit = limit or self.page_size
+
+        def fetch(page):
+            return self.get_transactions(chain_id, token_id, issuer_id, nf_token_id, addresses, to_from,
+                                         entry_hash, page, limit, order)
+
+        return self._iter_pages(fetch, limit, workers)
+
+    def iter_nf_tokens(self, chain_id=None, token_id=None, issuer_id=None, limit=None, order=None, workers=1):
+        """
+        Iterate over all issued non fungible tokens with `async for`, fetching pages lazily.
+
+        :param limit: the number of tokens requested per page; defaults to BaseAPI.page_size
+        :param workers: the number of pages fetched concurrently
+        :return: an async generator of token dicts
+        """
+
+        limit = limit or self.page_size
+
+        def fetch(page):
+            return self.get_nf_tokens(chain_id, token_id, issuer_id, page, limit, order)
+
+        return self._iter_pages(fetch, limit, workers)
+
+    async def get_all_transactions(self, chain_id=None, token_id=None, issuer_id=None, nf_token_id=None,
+                                   addresses=None, to_from=None, entry_hash=None, limit=None, order=None,
+                                   workers=8):
+        """
+        Download the full list of transactions matching the query, fetching pages concurrently.
+
+        :param limit: the number of transactions requested per page; defaults to BaseAPI.page_size
+        :param workers: the number of pages fetched concurrently
+        :return: a list of transaction dicts in the order returned by fatd
+        """
+
+        return [tx async for tx in self.iter_transactions(chain_id, token_id, issuer_id, nf_token_id, addresses,
+                                                          to_from, entry_hash, limit, order, workers)]
+
+    async def submit_many(self, transactions, window=8, max_window=64, submitted=None):
+        """
+        Sign and submit many transactions, keeping a bounded number of them in flight. See FATd.submit_many.
+
+        Unsigned transactions are signed in the event loop's default executor.
+
+        :return: an async generator of SubmitResults, in the order the submissions complete
+        """
+
+        limit = AdaptiveWindow(window, maximum=max_window)
+        congestion = (TokenSyncing,) + self.transport_errors
+        transactions = enumerate(transactions)
+        submitted = set() if submitted is None else submitted
+        loop = asyncio.get_event_loop()
+
+        async def submit(index, tx):
+            started = time.perf_counter()
+            entry_hash = None
+            try:
+                if getattr(tx, "_ext_ids", None) is None:
+                    await loop.run_in_executor(None, tx.sign)
+                entry_hash = tx.entry_hash()
+                if entry_hash in submitted:
+                    raise DuplicateTransaction(entry_hash)
+                submitted.add(entry_hash)
+                try:
+                    entry_hash = (await self.submit_transaction(tx))["result"]["entryhash"]
+                except BaseException:
+                    submitted.discard(entry_hash)
+                    raise
+            except Exception as error:
+                return SubmitResult(index, tx, entry_hash, error), None
+            return SubmitResult(index, tx, entry_hash), time.perf_counter() - started
+
+        pending = set()
+        exhausted = False
+        try:
+            while pending or not exhausted:
+                while not exhausted and len(pending) < limit.limit:
+                    item = next(transactions, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(submit(*item)))
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result, latency = task.result()
+                    if latency is not None:
+                        limit.success(latency)
+                    elif isinstance(result.error, congestion):
+                        limit.failure()
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _iter_pages(fetch, limit, workers=1):
+        if workers < 1:
+            raise InvalidParam("Workers must be at least 1!")
+
+        pending = deque(asyncio.ensure_future(fetch(page)) for page in range(1, workers + 1))
+        next_page = workers + 1
+        page = 1
+        try:
+            while True:
+                try:
+                    items = (await pending.popleft())["result"]
+                except TransactionNotFound:
+                    if page == 1:
+                        raise
+                    return
+
+                if len(items) < limit:
+                    for item in items:
+                        yield item
+                    return
+
+                pending.append(asyncio.ensure_future(fetch(next_page)))
+                next_page += 1
+                page += 1
+                for item in items:
+                    yield item
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    # Retrieve errors from pages past the end so they aren't reported as unhandled.
+                    task.exception()
+                task.cancel()
+
+    def batch(self, batch_size=None):
+        """
+        Start a batch of RPC calls. Use it with `async with`, or await its send() method.
+
+        :param batch_size: the maximum number of calls per HTTP request; defaults to BaseAPI.batch_size
+        :return: an AsyncBatch bound to this client
+        """
+
+        return AsyncBatch(self, batch_size)
+
+
+class AsyncBatch(Batch):
+    """A Batch for AsyncFATd. Queued calls are sent by awaiting send() or leaving an `async with` block."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.send()
+
+    async def send(self):
+        """
+        Send all queued calls that have not been sent yet.
+
+        :return: the list of sent BatchCall objects
+        """
+
+        pending = [call for call in self.calls if not call.done]
+        responses = await self.client._batch_request([(c.method, c.params) for c in pending], self.batch_size)
+        for call, response in zip(pending, responses):
+            call._resolve(response)
+        return pending
+
+
+__all__ = ["AsyncFATd", "AsyncBatch"]
@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# RPC methods whose successful responses never change.
+IMMUTABLE_METHODS = frozenset(["get-issuance", "get-transaction"])
+# RPC methods whose responses only change when the node's sync height moves.
+SYNC_HEIGHT_METHODS = frozenset(["get-balance", "get-balances", "get-nf-balance", "get-stats"])
+
+
+def cache_key(method: str, params: dict = None) -> str:
+    """
+    Build a cache key for an RPC call that doesn't depend on the order params were given in.
+
+    :param method: the RPC method name
+    :param params: the RPC params as a dict
+    :return: the cache key as a str
+    """
+
+    return method + ":" + json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024):
+        """
+        A thread safe in-memory cache that evicts the least recently used entry once full.
+
+        Cached responses are shared between callers and must not be mutated.
+
+        :param maxsize: the maximum number of entries held
+        """
+
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    def __init__(self, path: str, memory_size: int = 1024):
+        """
+        A cache persisted to an SQLite database, so that it survives restarts and can be shared between processes.
+
+        Entries are never evicted. Recently used entries are also kept in an in-memory LRUCache.
+
+        :param path: the path of the database file
+        :param memory_size: the maximum number of entries also held in memory
+        """
+
+        self.path = path
+        self._memory = LRUCache(memory_size)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key, default=None):
+        value = self._memory.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            row = self._db.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+
+        value = json.loads(row[0])
+        self._memory.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self._memory.set(key, value)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+
+    def clear(self):
+        self._memory.clear()
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class SyncHeightCache:
+    def __init__(self, maxsize: int = 1024, interval: float = 30.0):
+        """
+        An in-memory cache whose entries are only valid at the sync height they were fetched at.
+
+        The client polls the node's sync height at most once per interval and drops all entries when it has moved.
+
+        :param maxsize: the maximum number of entries held
+        :param interval: the minimum number of seconds between two sync height checks
+        """
+
+        self.interval = interval
+        self.height = None
+        self._checked_at = None
+        self._checking = False
+        self._entries = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, method: str, params: dict = None) -> str:
+        """
+        Build the cache key for an RPC call at the current sync height.
+
+        Responses to requests made before the height moved are stored under the old height and never served.
+        """
+
+        return "{}@{}".format(self.height, cache_key(method, params))
+
+    def claim_check(self) -> bool:
+        """
+        Claim the next sync height check if the interval has passed since the last successful one and no other
+        check is in flight.
+
+        :return: True if the caller should fetch the sync height and pass it to update_height(), or call
+            check_failed() if it couldn't
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            if self._checking or (self._checked_at is not None and now - self._checked_at < self.interval):
+                return False
+            self._checking = True
+            return True
+
+    def update_height(self, height: int):
+        with self._lock:
+            if height != self.height:
+                self._entries.clear()
+                self.height = height
+            self._checked_at = time.monotonic()
+            self._checking = False
+
+    def check_failed(self):
+        """
+        Release a claimed check that couldn't fetch the sync height. Entries are neither served nor stored until the
+        next check succeeds, and the next request checks again.
+        """
+
+        with self._lock:
+            self.height = None
+            self._checking = False
+
+    def get(self, key, default=None):
+        if self.height is None:
+            return default
+        return self._entries.get(key, default)
+
+    def set(self, key, value):
+        if self.height is not None:
+            self._entries.set(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.height = None
+            self._checked_at = None
+            self._checking = False
+
+
+__all__ = ["cache_key", "IMMUTABLE_METHODS", "SYNC_HEIGHT_METHODS", "LRUCache", "DiskCache", "SyncHeightCache"]
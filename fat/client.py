@@ -1,15 +1,38 @@
 import random
 import string
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Union
 from urllib.parse import urljoin
+from .addresses import canonical_address
 from .fat0.transactions import Transaction
-from .errors import handle_error_response, InvalidParam, MissingRequiredParameter
-from .session import APISession
+from .errors import (build_error, DuplicateTransaction, FATdAPIError, InvalidParam, MissingRequiredParameter,
+                     TokenSyncing, TransactionNotFound)
+from .cache import cache_key, IMMUTABLE_METHODS, LRUCache, SYNC_HEIGHT_METHODS
+from .codec import get_codec
+from .session import AdaptiveWindow, APISession
+from .singleflight import SingleFlight
+from requests.exceptions import RequestException
 from factom_keys.fct import FactoidAddress
 
+# RPC methods that change state on the node.
+WRITE_METHODS = frozenset(["send-transaction"])
+
 
 class BaseAPI(object):
-    def __init__(self, ec_address=None, fct_address=None, host=None, username=None, password=None, certfile=None):
+    # Maximum number of calls packed into a single JSON-RPC batch request.
+    batch_size = 100
+    # Number of items requested per page by the paginating iterators.
+    page_size = 100
+    # Exceptions raised for failed connections and timeouts.
+    transport_errors = (RequestException,)
+
+    def __init__(self, ec_address=None, fct_address=None, host=None, username=None, password=None, certfile=None,
+                 cache=None, cache_methods=None, sync_cache=None, observers=None, codec=None,
+                 pool_connections=10, pool_maxsize=10, timeout=None, keep_alive=True, retry_policy=None,
+                 coalesce=True):
         """
         Instantiate a new API client.
         Args:
@@ -22,6 +45,31 @@ class BaseAPI(object):
             password (str): RPC password for protected APIs.
             certfile (str): Path to certificate file to verify for TLS
                 connections (mostly untested).
+            cache: Cache for RPC responses, e.g. fat.cache.LRUCache or
+                fat.cache.DiskCache. Responses of immutable methods
+                (get-issuance, get-transaction) are always cached. Defaults
+                to an in-memory LRUCache; pass False to disable caching.
+            cache_methods (iterable): Additional RPC method names whose
+                responses should be cached.
+            sync_cache (fat.cache.SyncHeightCache): Cache for responses of
+                get-balance, get-balances, get-nf-balance and get-stats that
+                is invalidated whenever the node's sync height moves.
+                Disabled by default.
+            observers (list): fat.metrics.Observer instances notified of
+                every HTTP request, e.g. fat.metrics.Metrics.
+            codec: JSON codec from fat.codec used to encode requests and
+                decode responses. Defaults to the fastest one installed.
+            pool_connections (int): Number of hosts to keep connection pools
+                for.
+            pool_maxsize (int): Maximum number of connections kept open to
+                the node. Raise it when sharing the client between threads.
+            timeout (float or tuple): Default request timeout in seconds, or
+                a (connect, read) tuple. No timeout by default.
+            keep_alive (bool): Reuse connections between requests.
+            retry_policy (fat.session.RetryPolicy): Decides which failed
+                requests are retried. No retries by default.
+            coalesce (bool): Share a single in-flight request between
+                concurrent identical read calls.
         """
         self.ec_address = ec_address
         self.fct_address = fct_address
@@ -30,7 +78,9 @@ class BaseAPI(object):
         if host:
             self.host = host
 
-        self.session = APISession()
+        self.session = APISession(pool_connections, pool_maxsize, timeout, keep_alive)
+        self.retry_policy = retry_policy
+        self.single_flight = SingleFlight() if coalesce else None
 
         if username and password:
             self.session.init_basic_auth(username, password)
@@ -38,6 +88,14 @@ class BaseAPI(object):
         if certfile:
             self.session.init_tls(certfile)
 
+        if cache is None:
+            cache = LRUCache()
+        self.cache = cache if cache is not False else None
+        self.cache_methods = frozenset(cache_methods or ())
+        self.sync_cache = sync_cache
+        self.observers = list(observers or ())
+        self.codec = codec or get_codec()
+
     @property
     def url(self):
         return urljoin(self.host, self.version)
@@ -46,26 +104,275 @@ class BaseAPI(object):
     def _xact_name():
         return "TX_{}".format("".join(random.choices(string.ascii_uppercase + string.digits, k=6)))
 
-    def _request(self, method, params=None, request_id: int = 0):
+    def _request(self, method, params=None, request_id: int = 0, raw: bool = False):
+        if method in SYNC_HEIGHT_METHODS:
+            self._refresh_sync_height()
+        cache, key = self._cache_for(method, params)
+        if cache is not None:
+            response = cache.get(key)
+            if response is not None:
+                return self.codec.dumps(response) if raw else response
+
         data = {"jsonrpc": "2.0", "id": request_id, "method": method}
         if params:
             data["params"] = params
 
-        resp = self.session.request("POST", self.url, json=data)
-        print(f"Resp status code: {resp.status_code}")
-        print(f"Response: {resp.json()}")
-        if resp.status_code >= 400:
-            handle_error_response(resp)
+        if self.single_flight is not None and method not in WRITE_METHODS:
+            flight_key = (raw, cache_key(method, params))
+            response = self.single_flight.do(flight_key, lambda: self._post(method, data, raw))
+        else:
+            response = self._post(method, data, raw)
+
+        if cache is not None:
+            body = self.codec.loads(response) if raw else response
+            if "result" in body:
+                cache.set(key, body)
+        return response
+
+    @property
+    def coalesced(self) -> int:
+        """The number of requests that were answered by sharing an identical in-flight request."""
+        return self.single_flight.coalesced if self.single_flight is not None else 0
+
+    def call(self, method: str, params: dict = None, raw: bool = False):
+        """
+        Make an arbitrary RPC call.
+
+        :param method: the RPC method name, e.g. "get-transactions"
+        :param params: the RPC params as a dict
+        :param raw: return the response body as undecoded bytes, for callers that forward it unchanged
+        :return: the JSON response, or its bytes if raw is set
+        """
+
+        return self._request(method, params, raw=raw)
+
+    def _post(self, method, data, raw=False, retry=True):
+        """
+        POST a JSON-RPC request or batch to the node, retrying failures the retry policy allows.
+
+        The response body is decoded at most once.
 
-        return resp.json()
+        :param method: the RPC method name used to label the request for observers and the retry policy
+        :param data: the JSON-RPC request object, or list of objects for a batch
+        :param raw: return the response body undecoded, unless it is an error
+        :param retry: allow the request to be retried
+        :return: the decoded JSON response, or its bytes if raw is set
+        """
+
+        attempt = 0
+        while True:
+            try:
+                return self._post_once(method, data, raw)
+            except (FATdAPIError,) + self.transport_errors as error:
+                if not (retry and self.retry_policy and self.retry_policy.should_retry(method, error, attempt)):
+                    raise
+                time.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+
+    def _post_once(self, method, data, raw=False, timeout=None):
+        """
+        POST a JSON-RPC request or batch to the node once and notify the observers.
+
+        The session's default timeout applies unless a timeout is given.
+        """
+
+        payload = self.codec.dumps(data)
+        content = b""
+        started = time.perf_counter()
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        try:
+            resp = self.session.request("POST", self.url, data=payload, **kwargs)
+            content = resp.content
+            if resp.status_code >= 400:
+                raise build_error(self.codec.loads(content).get("error", {}), response=resp)
+            body = content if raw else self.codec.loads(content)
+        except Exception as error:
+            if self.observers:
+                self._record(method, started, len(payload), len(content), error)
+            raise
+
+        if self.observers:
+            self._record(method, started, len(payload), len(content))
+        return body
+
+    def _record(self, method, started, request_size, response_size, error=None):
+        latency = time.perf_counter() - started
+        for observer in self.observers:
+            observer.record(method, latency, request_size, response_size, error)
+
+    def add_observer(self, observer):
+        """
+        Register an observer to be notified of every HTTP request.
+
+        :param observer: a fat.metrics.Observer
+        """
+
+        self.observers.append(observer)
+        return observer
+
+    def _cache_for(self, method, params=None):
+        """
+        Get the cache the response of an RPC call is stored in.
+
+        :param method: the RPC method name
+        :param params: the RPC params as a dict
+        :return: a tuple of the cache and the key to store the response under, or (None, None) if the
+            response should not be cached
+        """
+
+        if self.cache is not None and (method in IMMUTABLE_METHODS or method in self.cache_methods):
+            return self.cache, cache_key(method, params)
+        if self.sync_cache is not None and method in SYNC_HEIGHT_METHODS:
+            return self.sync_cache, self.sync_cache.key(method, params)
+        return None, None
+
+    def _refresh_sync_height(self):
+        """
+        Poll the node's sync height for the sync height cache, at most once per its interval. If the poll fails, the
+        read that triggered it is still sent, just not served from or stored in the cache.
+        """
+
+        if self.sync_cache is None or not self.sync_cache.claim_check():
+            return
+        height = None
+        try:
+            height = self.get_sync_status()["result"]["syncheight"]
+        except (FATdAPIError,) + self.transport_errors:
+            pass
+        finally:
+            if height is None:
+                self.sync_cache.check_failed()
+            else:
+                self.sync_cache.update_height(height)
+
+    def _cached_responses(self, calls):
+        """
+        Look up a list of (method, params) calls in the response caches.
+
+        :return: a tuple of two lists: the cached response of each call, or None where there is none;
+            and the (cache, key) pair to store the response of each call under
+        """
+
+        responses = []
+        entries = []
+        for method, params in calls:
+            cache, key = self._cache_for(method, params)
+            responses.append(cache.get(key) if cache is not None else None)
+            entries.append((cache, key))
+        return responses, entries
+
+    def _batch_request(self, calls, batch_size=None):
+        """
+        Send several calls as JSON-RPC 2.0 batch requests. Cached responses are not requested again.
+
+        :param calls: a list of (method, params) tuples
+        :param batch_size: the maximum number of calls per HTTP request
+        :return: a list of JSON responses in the same order as calls
+        """
+
+        batch_size = batch_size or self.batch_size
+        if batch_size < 1:
+            raise InvalidParam("Batch size must be at least 1!")
+
+        if any(method in SYNC_HEIGHT_METHODS for method, _ in calls):
+            self._refresh_sync_height()
+        responses, entries = self._cached_responses(calls)
+        misses = [i for i, response in enumerate(responses) if response is None]
+        for start in range(0, len(misses), batch_size):
+            chunk = misses[start:start + batch_size]
+            for i, response in zip(chunk, self._send_batch([calls[i] for i in chunk])):
+                responses[i] = response
+                cache, key = entries[i]
+                if cache is not None and "result" in response:
+                    cache.set(key, response)
+
+        return responses
+
+    def _send_batch(self, calls):
+        body = self._post("batch", BaseAPI._batch_payload(calls), retry=self._may_retry_batch(calls))
+        return BaseAPI._batch_responses(len(calls), body)
+
+    def _may_retry_batch(self, calls):
+        # A batch is only retried if every call in it could be retried on its own.
+        if self.retry_policy is None:
+            return True
+        return not any(method in self.retry_policy.never_retry for method, _ in calls)
+
+    @staticmethod
+    def _batch_payload(calls):
+        data = []
+        for request_id, (method, params) in enumerate(calls):
+            call = {"jsonrpc": "2.0", "id": request_id, "method": method}
+            if params:
+                call["params"] = params
+            data.append(call)
+        return data
+
+    @staticmethod
+    def _batch_responses(num_calls, body):
+        """
+        Match the responses to a batch request back up with the calls, which were numbered by position.
+
+        :param num_calls: the number of calls in the batch
+        :param body: the decoded body of the batch response
+        :return: a list of JSON responses in the same order as the calls
+        """
+
+        # A batch that fails as a whole is answered with a single error object.
+        if isinstance(body, dict):
+            raise build_error(body.get("error", {}))
+
+        # Responses may arrive in any order; match them back up by id.
+        by_id = {r.get("id"): r for r in body}
+        responses = []
+        for request_id in range(num_calls):
+            response = by_id.get(request_id)
+            if response is None:
+                response = {"jsonrpc": "2.0", "id": request_id,
+                            "error": {"code": -1, "message": "No response for batched call"}}
+            responses.append(response)
+        return responses
+
+    def call_many(self, calls, batch_size=None):
+        """
+        Send many RPC calls, packed into as few HTTP requests as possible.
+
+        :param calls: an iterable of (method, params) tuples,
+            e.g. ("get-balance", {"chainid": ..., "address": ...})
+        :param batch_size: the maximum number of calls per HTTP request; defaults to BaseAPI.batch_size
+        :return: a list of JSON responses in the same order as calls
+        """
+
+        responses = self._batch_request(list(calls), batch_size)
+        for response in responses:
+            if "error" in response:
+                raise build_error(response["error"])
+        return responses
 
 
 class FATd(BaseAPI):
-    def __init__(self, ec_address=None, fct_address=None, host=None, username=None, password=None, certfile=None):
+    def __init__(self, ec_address=None, fct_address=None, host=None, username=None, password=None, certfile=None,
+                 **kwargs):
         tmp_host = host if host is not None else "http://localhost:8078"
-        super().__init__(ec_address, fct_address, tmp_host, username, password, certfile)
+        super().__init__(ec_address, fct_address, tmp_host, username, password, certfile, **kwargs)
 
     # RPC methods
+    def batch(self, batch_size=None):
+        """
+        Start a batch of RPC calls that are sent together as JSON-RPC batch requests.
+
+        Used as a context manager, the batch is sent when the block exits:
+
+            with fatd.batch() as batch:
+                balances = [batch.get_balance(address, chain_id=chain_id) for address in addresses]
+            results = [b.result for b in balances]
+
+        :param batch_size: the maximum number of calls per HTTP request; defaults to BaseAPI.batch_size
+        :return: a Batch bound to this client
+        """
+
+        return Batch(self, batch_size)
+
     def get_issuance(self, chain_id=None, token_id=None, issuer_id=None):
         """Get the issuance entry for a token."""
         params = FATd.check_id_params(chain_id, token_id, issuer_id)
@@ -131,9 +438,100 @@ class FATd(BaseAPI):
         for arg, value in locals().copy().items():
             if arg in param_list and value is not None:
                 params[arg] = value
-        print(f"params: {params}")
         return self._request("get-nf-tokens", params)
 
+    def iter_transactions(self, chain_id=None, token_id=None, issuer_id=None, nf_token_id=None, addresses=None,
+                          to_from=None, entry_hash=None, limit=None, order=None, workers=1):
+        """
+        Iterate over all transactions matching the query, fetching pages lazily.
+
+        Up to `workers` pages are fetched in the background while the current one is consumed, so
+        at most workers + 1 pages are held in memory at any time. Transactions are yielded in order.
+
+        :param limit: the number of transactions requested per page; defaults to BaseAPI.page_size
+        :param workers: the number of pages fetched concurrently
+        :return: a generator of transaction dicts, as found in the "result" of get_transactions
+        """
+
+        limit = limit or self.page_size
+
+        def fetch(page):
+            return self.get_transactions(chain_id, token_id, issuer_id, nf_token_id, addresses, to_from,
+                                         entry_hash, page, limit, order)
+
+        return self._iter_pages(fetch, limit, workers)
+
+    def iter_nf_tokens(self, chain_id=None, token_id=None, issuer_id=None, limit=None, order=None, workers=1):
+        """
+        Iterate over all issued non fungible tokens, fetching pages lazily.
+
+        :param limit: the number of tokens requested per page; defaults to BaseAPI.page_size
+        :param workers: the number of pages fetched concurrently
+        :return: a generator of token dicts, as found in the "result" of get_nf_tokens
+        """
+
+        limit = limit or self.page_size
+
+        def fetch(page):
+            return self.get_nf_tokens(chain_id, token_id, issuer_id, page, limit, order)
+
+        return self._iter_pages(fetch, limit, workers)
+
+    def get_all_transactions(self, chain_id=None, token_id=None, issuer_id=None, nf_token_id=None, addresses=None,
+                             to_from=None, entry_hash=None, limit=None, order=None, workers=8):
+        """
+        Download the full list of transactions matching the query, fetching pages in parallel.
+
+        :param limit: the number of transactions requested per page; defaults to BaseAPI.page_size
+        :param workers: the number of pages fetched concurrently
+        :return: a list of transaction dicts in the order returned by fatd
+        """
+
+        return list(self.iter_transactions(chain_id, token_id, issuer_id, nf_token_id, addresses, to_from,
+                                           entry_hash, limit, order, workers))
+
+    @staticmethod
+    def _iter_pages(fetch, limit, workers=1):
+        """
+        Walk pages starting at page 1 until a short or empty page is returned.
+
+        A sliding window of `workers` pages is kept in flight ahead of the page being consumed.
+
+        :param fetch: a function taking a page number and returning the JSON response for that page
+        :param limit: the page size the pages were requested with
+        :param workers: the number of pages fetched concurrently
+        """
+
+        if workers < 1:
+            raise InvalidParam("Workers must be at least 1!")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(executor.submit(fetch, page) for page in range(1, workers + 1))
+            next_page = workers + 1
+            page = 1
+            try:
+                while True:
+                    try:
+                        items = pending.popleft().result()["result"]
+                    except TransactionNotFound:
+                        # fatd answers a query past the last transaction with an error rather than an empty page.
+                        if page == 1:
+                            raise
+                        return
+
+                    if len(items) < limit:
+                        yield from items
+                        return
+
+                    pending.append(executor.submit(fetch, next_page))
+                    next_page += 1
+                    page += 1
+                    yield from items
+            finally:
+                # Don't wait on speculative requests for pages past the end.
+                for future in pending:
+                    future.cancel()
+
     def send_transaction(self, ext_ids, content, chain_id=None, token_id=None, issuer_id=None):
         """Send A FAT transaction to a token."""
         params = FATd.check_id_params(chain_id, token_id, issuer_id)
@@ -174,6 +572,75 @@ class FATd(BaseAPI):
             },
         )
 
+    def submit_many(self, transactions, window=8, max_window=64, submitted=None):
+        """
+        Sign and submit many transactions, keeping a bounded number of them in flight.
+
+        The number in flight adapts to the node: it grows while submissions succeed and halves when the node
+        fails, reports it is syncing or slows down. Transactions that haven't been signed yet are signed by the
+        workers just before they are sent. Nothing is retried.
+
+        Entry hashes are computed locally once a transaction is signed. A transaction whose entry hash is already
+        in flight or submitted isn't sent again; its result has a DuplicateTransaction error. Results of failed
+        submissions still carry the local entry hash, so their status can be looked up.
+
+        :param transactions: an iterable of fat0 or fat1 Transaction objects, consumed lazily
+        :param window: the number of transactions in flight to start with
+        :param max_window: the largest number of transactions in flight
+        :param submitted: a set of the entry hashes already submitted, for retrying a run. Successfully submitted
+            entry hashes are added to it.
+        :return: a generator of SubmitResults, in the order the submissions complete
+        """
+
+        limit = AdaptiveWindow(window, maximum=max_window)
+        congestion = (TokenSyncing,) + self.transport_errors
+        transactions = enumerate(transactions)
+        submitted = set() if submitted is None else submitted
+        lock = threading.Lock()
+
+        def submit(index, tx):
+            started = time.perf_counter()
+            entry_hash = None
+            try:
+                if getattr(tx, "_ext_ids", None) is None:
+                    tx.sign()
+                entry_hash = tx.entry_hash()
+                with lock:
+                    if entry_hash in submitted:
+                        raise DuplicateTransaction(entry_hash)
+                    submitted.add(entry_hash)
+                try:
+                    entry_hash = self.submit_transaction(tx)["result"]["entryhash"]
+                except Exception:
+                    with lock:
+                        submitted.discard(entry_hash)
+                    raise
+            except Exception as error:
+                return SubmitResult(index, tx, entry_hash, error), None
+            return SubmitResult(index, tx, entry_hash), time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=max_window) as executor:
+            pending = set()
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < limit.limit:
+                    item = next(transactions, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        pending.add(executor.submit(submit, *item))
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result, latency = future.result()
+                    if latency is not None:
+                        limit.success(latency)
+                    elif isinstance(result.error, congestion):
+                        limit.failure()
+                    yield result
+
     @staticmethod
     def validate_address(address: Union[FactoidAddress, str]) -> str:
         """
@@ -182,13 +649,7 @@ class FATd(BaseAPI):
         :param address: a Factoid address as a str or a FactoidAddress object
         """
 
-        if isinstance(address, FactoidAddress):
-            address = address.to_string()
-        elif isinstance(address, str):
-            address = FactoidAddress(address_string=address).to_string()
-        else:
-            raise InvalidParam("Invalid address!")
-        return address
+        return canonical_address(address)
 
     @staticmethod
     def check_id_params(chain_id, token_id, issuer_id):
@@ -198,3 +659,116 @@ class FATd(BaseAPI):
             return {"tokenid": token_id, "issuerid": issuer_id}
         else:
             raise MissingRequiredParameter("Requires either chain_id or token_id AND issuer_id.")
+
+
+class BatchCall(object):
+    """A call queued on a Batch. Its response is available once the batch has been sent."""
+
+    def __init__(self, method, params=None):
+        self.method = method
+        self.params = params
+        self._response = None
+        self._error = None
+
+    @property
+    def done(self):
+        return self._response is not None or self._error is not None
+
+    @property
+    def response(self):
+        """The full JSON response of the call. Raises the matching FATdAPIError if the call failed."""
+        if self._error is not None:
+            raise self._error
+        if self._response is None:
+            raise RuntimeError("Batch has not been sent yet.")
+        return self._response
+
+    @property
+    def result(self):
+        """The "result" member of the call's JSON response."""
+        return self.response["result"]
+
+    def _resolve(self, response):
+        if "error" in response:
+            self._error = build_error(response["error"])
+        else:
+            self._response = response
+
+
+class SubmitResult(object):
+    """The outcome of submitting one transaction with FATd.submit_many."""
+
+    def __init__(self, index, tx, entry_hash=None, error=None):
+        self.index = index
+        self.tx = tx
+        self.entry_hash = entry_hash
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "SubmitResult(index={}, entry_hash={!r}, error={!r})".format(
+            self.index, self.entry_hash, self.error
+        )
+
+
+class Batch(object):
+    """
+    Collects FATd RPC calls and sends them as JSON-RPC batch requests.
+
+    Every FATd RPC method is available on a Batch, but instead of sending the call it
+    queues it and returns a BatchCall that is resolved when the batch is sent. Methods that
+    make several calls or wait on their results, such as iter_transactions or submit_many,
+    are only available on the client.
+    """
+
+    # The single call RPC methods of FATd. Each builds its params and hands them to _request.
+    call = FATd.call
+    get_issuance = FATd.get_issuance
+    get_transaction = FATd.get_transaction
+    get_transactions = FATd.get_transactions
+    get_balance = FATd.get_balance
+    get_nf_balance = FATd.get_nf_balance
+    get_stats = FATd.get_stats
+    get_nf_token = FATd.get_nf_token
+    get_nf_tokens = FATd.get_nf_tokens
+    send_transaction = FATd.send_transaction
+    get_daemon_tokens = FATd.get_daemon_tokens
+    get_daemon_properties = FATd.get_daemon_properties
+    get_sync_status = FATd.get_sync_status
+    get_balances = FATd.get_balances
+    submit_transaction = FATd.submit_transaction
+
+    def __init__(self, client: FATd, batch_size=None):
+        self.client = client
+        self.batch_size = batch_size or client.batch_size
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+
+    def _request(self, method, params=None, request_id: int = 0, raw: bool = False):
+        if raw:
+            raise InvalidParam("Batched calls can't return raw responses!")
+        call = BatchCall(method, params)
+        self.calls.append(call)
+        return call
+
+    def send(self):
+        """
+        Send all queued calls that have not been sent yet.
+
+        :return: the list of sent BatchCall objects
+        """
+
+        pending = [call for call in self.calls if not call.done]
+        responses = self.client._batch_request([(c.method, c.params) for c in pending], self.batch_size)
+        for call, response in zip(pending, responses):
+            call._resolve(response)
+        return pending
@@ -0,0 +1,67 @@
+import json
+
+
+class JSONCodec:
+    """Encodes requests and decodes responses with the standard library json module."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    @staticmethod
+    def loads(data: bytes):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Encodes and decodes with orjson, if it is installed."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class UjsonCodec:
+    """Encodes and decodes with ujson, if it is installed."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+        self.loads = ujson.loads
+
+    def dumps(self, obj) -> bytes:
+        return self._ujson.dumps(obj).encode()
+
+
+CODECS = {"json": JSONCodec, "orjson": OrjsonCodec, "ujson": UjsonCodec}
+
+
+def get_codec(name: str = None):
+    """
+    Get a JSON codec by name.
+
+    :param name: one of "json", "orjson" or "ujson". If not given, the fastest installed codec is used.
+    :return: a codec object with dumps(obj) -> bytes and loads(bytes) methods
+    """
+
+    if name is not None:
+        return CODECS[name]()
+
+    for codec in (OrjsonCodec, UjsonCodec):
+        try:
+            return codec()
+        except ImportError:
+            pass
+    return JSONCodec()
+
+
+__all__ = ["JSONCodec", "OrjsonCodec", "UjsonCodec", "get_codec"]
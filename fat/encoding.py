@@ -0,0 +1,24 @@
+import json
+
+# The canonical, whitespace-free encoding of FAT entry content. json.dumps builds a new encoder for every call
+# when given separators; this one is built once.
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def encode_content(inputs: dict, outputs: dict, metadata=None) -> bytes:
+    """
+    Encode FAT transaction content.
+
+    :param inputs: a dict of addresses to FAT-0 amounts or FAT-1 token ID lists
+    :param outputs: a dict of addresses to FAT-0 amounts or FAT-1 token ID lists
+    :param metadata: the transaction metadata, left out if empty
+    :return: the same bytes as json.dumps(content, separators=(",", ":")).encode()
+    """
+
+    content = {"inputs": inputs, "outputs": outputs}
+    if metadata:
+        content["metadata"] = metadata
+    return _encoder.encode(content).encode()
+
+
+__all__ = ["encode_content"]
@@ -1,4 +1,16 @@
 def handle_error_response(resp):
+    raise build_error(resp.json().get("error", {}), response=resp)
+
+
+def build_error(error, response=None):
+    """
+    Build the FATdAPIError subclass matching a JSON-RPC error object.
+
+    :param error: the "error" member of a JSON-RPC response as a dict
+    :param response: the HTTP response the error was received in, if any
+    :return: an instance of the matching FATdAPIError subclass
+    """
+
     codes = {
         -1: FATdAPIError,
         -32600: InvalidRequest,
@@ -14,12 +26,11 @@ def handle_error_response(resp):
         -32805: TokenSyncing,
     }
 
-    error = resp.json().get("error", {})
     message = error.get("message")
     code = error.get("code", -1)
     data = error.get("data", {})
 
-    raise codes[code](message=message, code=code, data=data, response=resp)
+    return codes.get(code, FATdAPIError)(message=message, code=code, data=data, response=response)
 
 
 class FATdAPIError(Exception):
@@ -97,5 +108,19 @@ class InvalidParam(ValueError):
     pass
 
 
+class InvalidAddresses(InvalidParam):
+    def __init__(self, addresses):
+        self.addresses = addresses
+        shown = ", ".join(repr(address) for address in addresses[:5])
+        more = " and {} more".format(len(addresses) - 5) if len(addresses) > 5 else ""
+        super().__init__("Invalid addresses: {}{}".format(shown, more))
+
+
 class MissingRequiredParameter(Exception):
     pass
+
+
+class DuplicateTransaction(Exception):
+    def __init__(self, entry_hash):
+        self.entry_hash = entry_hash
+        super().__init__("Transaction {} has already been submitted.".format(entry_hash))
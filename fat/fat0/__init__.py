@@ -1,2 +1,3 @@
 from .transactions import Transaction
 from .issuance import Issuance
+from .compact import CompactTransaction
@@ -0,0 +1,86 @@
+import json
+from typing import List
+from fat.addresses import validate_addresses
+from fat.errors import InvalidParam
+from fat.fat0.transactions import Transaction
+from fat.signing import EXT_ID_LENGTH_SIZE, SIGNER_EXT_IDS_SIZE
+
+# The largest entry payload accepted by Factom.
+MAX_ENTRY_SIZE = 10240
+
+
+def plan_airdrop(
+    payouts: dict, source, chain_id=None, signer=None, metadata=None, max_kb=10
+) -> List[Transaction]:
+    """
+    Split a payout into the fewest transactions whose entries each fit within max_kb KB.
+
+    Entries cost 1 EC per started KB of content and ext_ids, so packing outputs up to a KB boundary pays for every
+    byte used. Entry sizes are tracked as outputs are added, without serializing the content.
+
+    :param payouts: a dict of Factoid addresses, as str, to the amounts they are paid
+    :param source: the address the tokens are sent from, or the coinbase address to mint them
+    :param chain_id: the chain ID of the token, set on every transaction
+    :param signer: the private key of the source, or of the issuer when minting, added to every transaction
+    :param metadata: metadata added to every transaction
+    :param max_kb: the number of KB, at most 10, each entry may take
+    :return: a list of unsigned Transactions
+    """
+
+    if not 1 <= max_kb <= MAX_ENTRY_SIZE // 1024:
+        raise InvalidParam("max_kb must be between 1 and 10!")
+
+    source = Transaction.validate_address(source)
+    # Reports every invalid address at once.
+    payouts = dict(zip(validate_addresses(payouts), payouts.values()))
+    if source in payouts:
+        raise InvalidParam("The source can't be paid!")
+
+    # The size of a transaction without outputs or its input amount, '{"inputs":{"<source>":},"outputs":{}}'.
+    fixed = len('{"inputs":{"":},"outputs":{}}') + len(source)
+    if metadata:
+        fixed += len(',"metadata":') + len(json.dumps(metadata, separators=(",", ":")).encode())
+    fixed += len(Transaction()._timestamp) + SIGNER_EXT_IDS_SIZE
+    # The lengths of the timestamp ext_id and of the RCD and signature ext_ids of the signer.
+    fixed += EXT_ID_LENGTH_SIZE * (1 + 2 * 1)
+    limit = max_kb * 1024
+
+    plans = []
+    outputs = {}
+    size = fixed
+    total = 0
+    for address, amount in payouts.items():
+        if not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0:
+            raise InvalidParam("Invalid amount for {}!".format(address))
+
+        # '"<address>":<amount>', preceded by a comma unless it is the first output.
+        output_size = len(address) + 3 + len(str(amount)) + (1 if outputs else 0)
+        if outputs and size + output_size + len(str(total + amount)) > limit:
+            plans.append(outputs)
+            outputs = {}
+            size = fixed
+            total = 0
+            output_size -= 1
+
+        if size + output_size + len(str(amount)) > limit:
+            raise InvalidParam("A single output doesn't fit in {} KB!".format(max_kb))
+        outputs[address] = amount
+        size += output_size
+        total += amount
+    if outputs:
+        plans.append(outputs)
+
+    transactions = []
+    for outputs in plans:
+        tx = Transaction(inputs={source: sum(outputs.values())}, metadata=metadata)
+        # The outputs were validated above.
+        tx.outputs = outputs
+        if chain_id:
+            tx.set_chain_id(chain_id)
+        if signer:
+            tx.add_signer(signer)
+        transactions.append(tx)
+    return transactions
+
+
+__all__ = ["plan_airdrop"]
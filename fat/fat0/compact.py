@@ -0,0 +1,250 @@
+import math
+import time
+from array import array
+from functools import lru_cache
+from typing import List, Tuple, Union
+from factom_core.block_elements import Entry
+from factom_keys.fct import FactoidAddress, FactoidPrivateKey
+from factom_keys.serverid import ServerIDPrivateKey
+from fat.addresses import address_from_rcd_hash, rcd_hash
+from fat.encoding import encode_content
+from fat.errors import InvalidChainID, InvalidParam, InvalidTransaction
+from fat.fat0.transactions import Transaction
+from fat.signing import ext_ids_size, get_signers, keyring, sign_entry
+
+COINBASE_RCD_HASH = rcd_hash("FA1zT4aFpEvcnPqPCigB3fvGu4Q4mTXY22iiuV69DqE1pNhdF2MC")
+RCD_HASH_SIZE = 32
+
+_now = [None, None]
+
+
+def _timestamp() -> str:
+    # Transactions created within the same second share one timestamp string.
+    now = int(time.time())
+    if _now[0] != now:
+        _now[:] = [now, str(now)]
+    return _now[1]
+
+
+@lru_cache(maxsize=64)
+def _chain_id_bytes(chain_id: str) -> bytes:
+    # Transactions on the same chain share one bytes object.
+    return bytes.fromhex(chain_id)
+
+
+class CompactTransaction:
+    __slots__ = ("_rcd_hashes", "_amounts", "_num_inputs", "_chain_id", "_timestamp", "_metadata", "signers",
+                 "_ext_ids", "_content", "_content_size")
+
+    def __init__(self, inputs=None, outputs=None, metadata=None, chain_id=None, signers=None):
+        """
+        A FAT-0 transaction with the same interface as Transaction, for holding many transactions in memory.
+
+        Inputs and outputs are kept as 32 byte RCD hashes in a single bytearray and their amounts in an array of
+        unsigned 64 bit integers, inputs first. Addresses are only encoded, and repeated addresses merged with the
+        last amount winning as in a dict, when the content is built. Signers are kept in a tuple. As with
+        Transaction, changing the transaction drops its signature.
+        """
+
+        self._timestamp = _timestamp()
+        self._rcd_hashes = bytearray()
+        self._amounts = array("Q")
+        self._num_inputs = 0
+        self._chain_id = None
+        self._ext_ids = None
+        self._content = None
+        self._content_size = self._ext_ids = self._content = None
+        self.metadata = metadata
+        self.signers = ()
+
+        if inputs:
+            for address, amount in inputs.items():
+                self.add_input(address, amount)
+
+        if outputs:
+            for address, amount in outputs.items():
+                self.add_output(address, amount)
+
+        if chain_id:
+            self.set_chain_id(chain_id)
+
+        if signers:
+            for s in signers:
+                self.add_signer(s)
+
+    @property
+    def chain_id(self):
+        return self._chain_id.hex() if self._chain_id is not None else None
+
+    @property
+    def metadata(self):
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata):
+        self._metadata = metadata
+        self._content_size = self._ext_ids = self._content = None
+
+    @property
+    def inputs(self) -> dict:
+        return self._entries(0, self._num_inputs, address_from_rcd_hash)
+
+    @property
+    def outputs(self) -> dict:
+        return self._entries(self._num_inputs, len(self._amounts), address_from_rcd_hash)
+
+    def _entries(self, start, stop, key=bytes):
+        entries = {}
+        hashes = self._rcd_hashes
+        for i in range(start, stop):
+            entries[key(bytes(hashes[i * RCD_HASH_SIZE:(i + 1) * RCD_HASH_SIZE]))] = self._amounts[i]
+        return entries
+
+    @staticmethod
+    def _validate_amount(amount) -> int:
+        if not isinstance(amount, int) or isinstance(amount, bool) or not 0 <= amount < 2 ** 64:
+            raise InvalidParam("Incorrect address or amount!")
+        return amount
+
+    def add_input(self, address: Union[FactoidAddress, str], amount: int):
+        """
+        Create an input entry from an address and amount.
+
+        :param address: the factoid input address as a str or FactoidAddress object
+        :param amount: the factoid input amount as an int
+        """
+
+        amount = CompactTransaction._validate_amount(amount)
+        position = self._num_inputs * RCD_HASH_SIZE
+        self._rcd_hashes[position:position] = rcd_hash(address)
+        self._amounts.insert(self._num_inputs, amount)
+        self._num_inputs += 1
+        self._content_size = self._ext_ids = self._content = None
+        return self
+
+    def add_output(self, address: Union[FactoidAddress, str], amount: int):
+        """
+        Create an output entry from an address and amount.
+
+        :param address: the factoid output address as a str or FactoidAddress object
+        :param amount: the factoid output amount as an int
+        """
+
+        amount = CompactTransaction._validate_amount(amount)
+        self._rcd_hashes += rcd_hash(address)
+        self._amounts.append(amount)
+        self._content_size = self._ext_ids = self._content = None
+        return self
+
+    def add_signer(self, signer: Union[FactoidPrivateKey, ServerIDPrivateKey, str]):
+        """
+        Add a signing key to the transaction.
+
+        :param signer: the private key for an input Factoid address or the private key for the issuing ID
+        """
+
+        self.signers += (Transaction.validate_signer(self, signer),)
+        self._ext_ids = self._content = None
+        return self
+
+    def set_metadata(self, data: dict):
+        self.metadata = data
+        return self
+
+    def set_chain_id(self, chain_id: str):
+        """
+        Set the chain id for the transaction.
+
+        :param chain_id: the chain id to submit the transaction entry on as a str
+        """
+
+        if not isinstance(chain_id, str):
+            raise InvalidChainID
+        self._chain_id = _chain_id_bytes(chain_id)
+        self._ext_ids = self._content = None
+        return self
+
+    def is_valid(self) -> bool:
+        """
+        Check transaction for the same error conditions as Transaction.is_valid.
+
+        :return: a bool representing whether the transaction is valid or not.
+        """
+
+        inputs = self._entries(0, self._num_inputs)
+        outputs = self._entries(self._num_inputs, len(self._amounts))
+        if not (len(inputs) == len(self.signers)):
+            return False
+        if not (inputs and outputs):
+            return False
+        if not self._chain_id:
+            return False
+        return sum(inputs.values()) == sum(outputs.values())
+
+    def is_mint(self) -> bool:
+        inputs = self._entries(0, self._num_inputs)
+        return len(inputs) == 1 and COINBASE_RCD_HASH in inputs
+
+    def build_content(self) -> bytes:
+        """
+        Build entry content, byte for byte the same as Transaction.build_content for the same inputs and outputs.
+
+        :return: entry content as bytes.
+        """
+
+        content = encode_content(self.inputs, self.outputs, self.metadata)
+        self._content_size = len(content)
+        return content
+
+    def size(self) -> int:
+        """
+        Calculate the size of the signed entry, as Transaction.size does. Only the length of the content is
+        cached, until the inputs, outputs or metadata change, to keep the transaction small.
+
+        :return: the entry payload size in bytes as an int
+        """
+
+        if self._content_size is None:
+            self.build_content()
+        return self._content_size + ext_ids_size(self._timestamp, len(self.signers))
+
+    def ec_cost(self) -> int:
+        """
+        Calculate the number of entry credits the signed entry costs, as Transaction.ec_cost does.
+
+        :return: the number of entry credits as an int
+        """
+
+        return math.ceil(self.size() / 1024)
+
+    def sign(self, keyring=keyring) -> Tuple[List[bytes], bytes]:
+        """
+        Sign transaction and create ext_ids and content.
+
+        :param keyring: the Keyring to look the signing keys up in, or None not to cache them
+        :return: a tuple of the extids and the content: ([extids], content)
+        """
+
+        if not self.is_valid():
+            raise InvalidTransaction
+
+        timestamp = self._timestamp.encode()
+        content = self.build_content()
+        signers = get_signers(self.signers, keyring)
+        self._ext_ids = [timestamp] + sign_entry(timestamp, self._chain_id, content, signers)
+        self._content = content
+        return self._ext_ids, self._content
+
+    def entry_hash(self) -> str:
+        """
+        Compute the Factom entry hash of the signed transaction, the hash fatd returns when it is submitted.
+
+        :return: the entry hash as a hex str
+        """
+
+        if self._ext_ids is None:
+            raise InvalidTransaction(message="Transaction has not been signed!")
+        return Entry(self._chain_id, self._ext_ids, self._content).entry_hash.hex()
+
+
+__all__ = ["CompactTransaction"]
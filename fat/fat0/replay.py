@@ -0,0 +1,158 @@
+import json
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from fat.errors import InvalidParam
+
+COINBASE_ADDRESS = "FA1zT4aFpEvcnPqPCigB3fvGu4Q4mTXY22iiuV69DqE1pNhdF2MC"
+# Amounts are held as signed 64 bit integers, although FAT-0 allows amounts up to 2 ** 64 - 1.
+MAX_AMOUNT = 2 ** 63 - 1
+
+
+class BalanceReplay:
+    def __init__(self, transactions=()):
+        """
+        Computes FAT-0 balances at any point in history by replaying a token's transactions.
+
+        Every input and output is stored as one transfer in columnar arrays of timestamps, integer address IDs
+        and signed amounts. Balances are then a single scatter-add of the transfers up to a point in time.
+
+        Amounts, balances and the total supply must fit in a signed 64 bit integer, at most 2 ** 63 - 1.
+
+        :param transactions: transactions in time order, as returned by get-transactions
+        """
+
+        if np is None:
+            raise ImportError("BalanceReplay requires numpy. Install it with `pip install fat[numpy]`.")
+
+        self.addresses = []
+        self.address_ids = {}
+        self._timestamps = array("q")
+        self._ids = array("q")
+        self._amounts = array("q")
+        self._columns = None
+        self._id(COINBASE_ADDRESS)
+        self.add(transactions)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _id(self, address):
+        address_id = self.address_ids.get(address)
+        if address_id is None:
+            address_id = self.address_ids[address] = len(self.addresses)
+            self.addresses.append(address)
+        return address_id
+
+    def add(self, transactions):
+        """
+        Append transactions to the history.
+
+        :param transactions: transaction dicts with "timestamp" and "data" as returned by get-transactions,
+            or the content of Transaction.build_content(), as bytes or dict, which is placed at timestamp 0
+        :return: self
+        :raises InvalidParam: if an amount is larger than MAX_AMOUNT
+        """
+
+        for tx in transactions:
+            if isinstance(tx, (bytes, str)):
+                tx = json.loads(tx)
+            timestamp = tx.get("timestamp", 0)
+            data = tx.get("data", tx)
+            for amount in (*data["inputs"].values(), *data["outputs"].values()):
+                if amount > MAX_AMOUNT:
+                    raise InvalidParam(
+                        "Amount {} is larger than BalanceReplay can hold, 2 ** 63 - 1!".format(amount)
+                    )
+
+            for address, amount in data["inputs"].items():
+                self._ids.append(self._id(address))
+                self._amounts.append(-amount)
+            for address, amount in data["outputs"].items():
+                self._ids.append(self._id(address))
+                self._amounts.append(amount)
+            self._timestamps.extend([timestamp] * (len(data["inputs"]) + len(data["outputs"])))
+
+        self._columns = None
+        return self
+
+    def _build(self):
+        if self._columns is None:
+            timestamps = np.frombuffer(self._timestamps, dtype=np.int64).copy()
+            ids = np.frombuffer(self._ids, dtype=np.int64).copy()
+            amounts = np.frombuffer(self._amounts, dtype=np.int64).copy()
+            if len(timestamps) and np.any(timestamps[1:] < timestamps[:-1]):
+                # A stable sort keeps transactions with equal timestamps in the order they were added.
+                order = np.argsort(timestamps, kind="stable")
+                timestamps, ids, amounts = timestamps[order], ids[order], amounts[order]
+            self._columns = timestamps, ids, amounts
+        return self._columns
+
+    def _count(self, timestamp):
+        timestamps, _, _ = self._build()
+        if timestamp is None:
+            return len(timestamps)
+        return int(np.searchsorted(timestamps, timestamp, side="right"))
+
+    def balance_array(self, timestamp=None):
+        """
+        :param timestamp: include only transactions at or before this Unix timestamp, or all if None
+        :return: an int64 array of balances indexed by address ID. The coinbase address, ID 0, holds minus the
+            circulating supply.
+        """
+
+        _, ids, amounts = self._build()
+        n = self._count(timestamp)
+        balances = np.zeros(len(self.addresses), dtype=np.int64)
+        np.add.at(balances, ids[:n], amounts[:n])
+        return balances
+
+    def balances(self, timestamp=None) -> dict:
+        """
+        :param timestamp: include only transactions at or before this Unix timestamp, or all if None
+        :return: the non-zero balances of all addresses, excluding the coinbase address
+        """
+
+        balances = self.balance_array(timestamp)
+        balances[0] = 0
+        return {self.addresses[i]: int(balances[i]) for i in np.flatnonzero(balances)}
+
+    def balance(self, address: str, timestamp=None) -> int:
+        """
+        :param address: a Factoid address
+        :param timestamp: include only transactions at or before this Unix timestamp, or all if None
+        :return: the balance of the address
+        """
+
+        address_id = self.address_ids.get(address)
+        if address_id is None:
+            return 0
+        _, ids, amounts = self._build()
+        n = self._count(timestamp)
+        return int(amounts[:n][ids[:n] == address_id].sum())
+
+    def balance_history(self, address: str):
+        """
+        :param address: a Factoid address
+        :return: a tuple of two arrays, the timestamps at which the balance of the address changed and the
+            balance after each change
+        """
+
+        timestamps, ids, amounts = self._build()
+        mask = ids == self.address_ids.get(address, -1)
+        return timestamps[mask], np.cumsum(amounts[mask])
+
+    def circulating(self, timestamp=None) -> int:
+        """
+        :param timestamp: include only transactions at or before this Unix timestamp, or all if None
+        :return: the number of tokens minted minus the number burned
+        """
+
+        return -self.balance(COINBASE_ADDRESS, timestamp)
+
+
+__all__ = ["BalanceReplay"]
@@ -1,8 +1,11 @@
-import json
-import hashlib
+import math
 from datetime import datetime as dt, timezone as tz
 from typing import List, Tuple, Union
 from fat.errors import InvalidParam, InvalidChainID, InvalidTransaction
+from fat.addresses import canonical_address
+from fat.encoding import encode_content
+from fat.signing import ext_ids_size, get_signers, keyring, sign_entry
+from factom_core.block_elements import Entry
 from factom_keys.fct import FactoidPrivateKey, FactoidAddress
 from factom_keys.serverid import ServerIDPrivateKey
 
@@ -10,6 +13,9 @@ from factom_keys.serverid import ServerIDPrivateKey
 class Transaction:
     def __init__(self, inputs=None, outputs=None, metadata=None, chain_id=None, signers=None):
         self._timestamp = str(int(dt.now(tz.utc).timestamp()))
+        self._built_content = None
+        self._ext_ids = None
+        self._content = None
 
         self.inputs = {}
         self.outputs = {}
@@ -32,6 +38,36 @@ class Transaction:
             for s in signers:
                 self.add_signer(s)
 
+    # The built content is cached until inputs, outputs or metadata change. Those changes, and adding a signer or
+    # setting the chain ID, also drop the signature, so the transaction must be signed again. Changing the inputs
+    # or outputs dicts in place isn't seen; use add_input and add_output, or assign a new dict.
+    @property
+    def inputs(self) -> dict:
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, inputs: dict):
+        self._inputs = inputs
+        self._built_content = self._ext_ids = self._content = None
+
+    @property
+    def outputs(self) -> dict:
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self, outputs: dict):
+        self._outputs = outputs
+        self._built_content = self._ext_ids = self._content = None
+
+    @property
+    def metadata(self):
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata):
+        self._metadata = metadata
+        self._built_content = self._ext_ids = self._content = None
+
     def add_input(self, address: Union[FactoidAddress, str], amount: int) -> None:
         """
         Create an input entry from an address and amount.
@@ -46,6 +82,7 @@ class Transaction:
             raise InvalidParam("Incorrect address or amount!")
 
         self.inputs[address] = amount
+        self._built_content = self._ext_ids = self._content = None
         return self
 
     def add_output(self, address: Union[FactoidAddress, str], amount: int) -> None:
@@ -62,6 +99,7 @@ class Transaction:
             raise InvalidParam("Incorrect address or amount!")
 
         self.outputs[address] = amount
+        self._built_content = self._ext_ids = self._content = None
         return self
 
     def add_signer(self, signer: Union[FactoidPrivateKey, ServerIDPrivateKey, str]) -> None:
@@ -72,6 +110,7 @@ class Transaction:
         """
 
         self.signers.append(self.validate_signer(signer))
+        self._ext_ids = self._content = None
         return self
 
     def set_metadata(self, data: dict) -> None:
@@ -94,6 +133,7 @@ class Transaction:
         if not isinstance(chain_id, str):
             raise InvalidChainID
         self.chain_id = chain_id
+        self._ext_ids = self._content = None
         return self
 
     @staticmethod
@@ -104,13 +144,7 @@ class Transaction:
         :param address: a Factoid address as a str or a FactoidAddress object
         """
 
-        if isinstance(address, FactoidAddress):
-            address = address.to_string()
-        elif isinstance(address, str):
-            address = FactoidAddress(address_string=address).to_string()
-        else:
-            raise InvalidParam("Invalid address!")
-        return address
+        return canonical_address(address)
 
     def validate_signer(
         self, signer: Union[FactoidPrivateKey, ServerIDPrivateKey, str]
@@ -181,51 +215,64 @@ class Transaction:
 
     def build_content(self) -> bytes:
         """
-        Build entry content.
+        Build entry content as whitespace-free JSON, cached until the inputs, outputs or metadata change.
 
         :return: entry content as bytes.
         """
 
-        content = {}
+        if self._built_content is None:
+            self._built_content = encode_content(self.inputs, self.outputs, self.metadata)
+        return self._built_content
+
+    def size(self) -> int:
+        """
+        Calculate the size of the signed entry as Factom counts it: the content, and the ext_ids of the timestamp
+        and every signer with their 2 byte lengths.
+
+        :return: the entry payload size in bytes as an int
+        """
 
-        content["inputs"] = self.inputs
-        content["outputs"] = self.outputs
+        return len(self.build_content()) + ext_ids_size(self._timestamp, len(self.signers))
 
-        if self.metadata:
-            content["metadata"] = self.metadata
+    def ec_cost(self) -> int:
+        """
+        Calculate the number of entry credits the signed entry costs, 1 for each started KB of its size.
 
-        # Including separators removes whitespace.
-        return json.dumps(content, separators=(",", ":")).encode()
+        :return: the number of entry credits as an int
+        """
 
-    def sign(self) -> Tuple[List[bytes], bytes]:
+        # 1 EC for each started KB of the entry payload.
+        return math.ceil(self.size() / 1024)
+
+    def sign(self, keyring=keyring) -> Tuple[List[bytes], bytes]:
         """
         Sign transaction and create ext_ids and content.
 
+        :param keyring: the Keyring to look the signing keys up in, or None not to cache them
         :return: a tuple of the extids and the content: ([extids], content)
         """
 
         if not self.is_valid():
             raise InvalidTransaction
 
-        ext_ids = [self._timestamp.encode()]
+        timestamp = self._timestamp.encode()
         content = self.build_content()
         chain_id = bytes.fromhex(self.chain_id)
 
-        for i, signer in enumerate(self.signers):
-            # Create message hash
-            message = bytearray()
-            message.extend(str(i).encode())
-            message.extend(self._timestamp.encode())
-            message.extend(chain_id)
-            message.extend(content)
-            message_hash = hashlib.sha512(message).digest()
-
-            # Get and append rcd and signature
-            if self.is_mint():
-                ext_ids.append(b"\x01" + signer.get_public_key().key_bytes)
-            else:
-                ext_ids.append(b"\x01" + signer.get_factoid_address().key_bytes)
-            ext_ids.append(signer.sign(message_hash))
+        # The RCD of each key is computed once and cached in the keyring, unless keyring is None.
+        signers = get_signers(self.signers, keyring)
+        ext_ids = [timestamp] + sign_entry(timestamp, chain_id, content, signers)
 
         self._ext_ids = ext_ids
         self._content = content
+
+    def entry_hash(self) -> str:
+        """
+        Compute the Factom entry hash of the signed transaction, the hash fatd returns when it is submitted.
+
+        :return: the entry hash as a hex str
+        """
+
+        if self._ext_ids is None:
+            raise InvalidTransaction(message="Transaction has not been signed!")
+        return Entry(bytes.fromhex(self.chain_id), self._ext_ids, self._content).entry_hash.hex()
@@ -0,0 +1,255 @@
+import json
+from array import array
+from bisect import bisect_right
+from fat.errors import InvalidParam
+
+# FAT-1 token IDs are unsigned 64 bit integers.
+MAX_TOKEN_ID = 2 ** 64 - 1
+
+
+class RangeSet:
+    def __init__(self, ids=()):
+        """
+        A set of non-fungible token IDs stored as sorted, coalesced, inclusive ranges.
+
+        The ranges are kept in two arrays of starts and ends, so a set holding {"min": 0, "max": 10000000} takes
+        the same memory as one holding a single ID. Membership is a binary search and set operations are a merge
+        of the two range lists, so their cost depends on the number of ranges rather than the number of IDs.
+
+        :param ids: token IDs in the FAT-1 JSON form, a list of ints and {"min": ..., "max": ...} dicts, or
+            another RangeSet. Overlapping IDs are merged; use from_json to reject them.
+        """
+
+        self._starts = array("Q")
+        self._ends = array("Q")
+        if isinstance(ids, RangeSet):
+            self._starts.extend(ids._starts)
+            self._ends.extend(ids._ends)
+        else:
+            self._extend(sorted(RangeSet._parse(ids)))
+
+    @classmethod
+    def from_json(cls, ids):
+        """
+        Create a RangeSet from the FAT-1 JSON form of a transaction input or output.
+
+        :param ids: a list of ints and {"min": ..., "max": ...} dicts
+        :return: a RangeSet
+        :raises InvalidParam: if the list is malformed or holds an ID more than once
+        """
+
+        return cls._from_disjoint(sorted(RangeSet._parse(ids)))
+
+    @classmethod
+    def disjoint_union(cls, sets):
+        """
+        Union sets that must not have any ID in common, such as the inputs of a FAT-1 transaction.
+
+        :param sets: an iterable of RangeSets
+        :return: a RangeSet of the IDs in any of the sets
+        :raises InvalidParam: if an ID is in more than one set
+        """
+
+        return cls._from_disjoint(sorted(r for ids in sets for r in ids.ranges()))
+
+    @classmethod
+    def _from_disjoint(cls, ranges):
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            if start <= end:
+                raise InvalidParam("Duplicate token IDs!")
+        rangeset = cls()
+        rangeset._extend(ranges)
+        return rangeset
+
+    @classmethod
+    def from_range(cls, start: int, end: int):
+        """
+        :param start: the first token ID
+        :param end: the last token ID, inclusive
+        :return: a RangeSet holding every ID from start to end
+        """
+
+        return cls([{"min": start, "max": end}])
+
+    @staticmethod
+    def _parse(ids):
+        if not isinstance(ids, (list, tuple)):
+            raise InvalidParam("Invalid amount!")
+
+        for entry in ids:
+            if isinstance(entry, bool):
+                raise InvalidParam("Invalid amount!")
+            if isinstance(entry, int):
+                start = end = entry
+            elif isinstance(entry, dict) and set(entry) == {"min", "max"}:
+                start, end = entry["min"], entry["max"]
+                if not (isinstance(start, int) and isinstance(end, int)) or start > end:
+                    raise InvalidParam("Invalid amount!")
+            else:
+                raise InvalidParam("Invalid amount!")
+            if start < 0 or end > MAX_TOKEN_ID:
+                raise InvalidParam("Invalid amount!")
+            yield start, end
+
+    def _extend(self, ranges):
+        # Appends ranges sorted by start, merging those that overlap or touch the last one.
+        starts, ends = self._starts, self._ends
+        for start, end in ranges:
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+
+    def ranges(self):
+        """
+        :return: an iterator of the (start, end) tuples of the inclusive ranges, in order
+        """
+
+        return zip(self._starts, self._ends)
+
+    @property
+    def range_count(self) -> int:
+        return len(self._starts)
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in self.ranges())
+
+    def __bool__(self):
+        return len(self._starts) > 0
+
+    def __iter__(self):
+        for start, end in self.ranges():
+            yield from range(start, end + 1)
+
+    def __contains__(self, token_id):
+        i = bisect_right(self._starts, token_id) - 1
+        return i >= 0 and self._ends[i] >= token_id
+
+    def __eq__(self, other):
+        if not isinstance(other, RangeSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __hash__(self):
+        return hash((self._starts.tobytes(), self._ends.tobytes()))
+
+    def __repr__(self):
+        return "RangeSet({!r})".format(self.to_json())
+
+    def union(self, other):
+        """
+        :param other: a RangeSet
+        :return: a RangeSet of the IDs in either set
+        """
+
+        result = RangeSet()
+        result._extend(RangeSet._merge(self.ranges(), other.ranges()))
+        return result
+
+    def intersection(self, other):
+        """
+        :param other: a RangeSet
+        :return: a RangeSet of the IDs in both sets
+        """
+
+        result = RangeSet()
+        a, b = list(self.ranges()), list(other.ranges())
+        i = j = 0
+        while i < len(a) and j < len(b):
+            start = max(a[i][0], b[j][0])
+            end = min(a[i][1], b[j][1])
+            if start <= end:
+                result._starts.append(start)
+                result._ends.append(end)
+            # Advance whichever range ends first; the other may still overlap the next one.
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return result
+
+    def difference(self, other):
+        """
+        :param other: a RangeSet
+        :return: a RangeSet of the IDs in this set but not in other
+        """
+
+        result = RangeSet()
+        b = list(other.ranges())
+        j = 0
+        for start, end in self.ranges():
+            while j < len(b) and b[j][1] < start:
+                j += 1
+            k = j
+            while k < len(b) and b[k][0] <= end:
+                if b[k][0] > start:
+                    result._starts.append(start)
+                    result._ends.append(b[k][0] - 1)
+                start = b[k][1] + 1
+                k += 1
+            if start <= end:
+                result._starts.append(start)
+                result._ends.append(end)
+        return result
+
+    def isdisjoint(self, other) -> bool:
+        """
+        :param other: a RangeSet
+        :return: whether the sets have no IDs in common
+        """
+
+        a, b = list(self.ranges()), list(other.ranges())
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i][1] < b[j][0]:
+                i += 1
+            elif b[j][1] < a[i][0]:
+                j += 1
+            else:
+                return False
+        return True
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    @staticmethod
+    def _merge(a, b):
+        a, b = iter(a), iter(b)
+        x, y = next(a, None), next(b, None)
+        while x is not None and y is not None:
+            if x <= y:
+                yield x
+                x = next(a, None)
+            else:
+                yield y
+                y = next(b, None)
+        rest, tail = (x, a) if x is not None else (y, b)
+        if rest is not None:
+            yield rest
+            yield from tail
+
+    def to_json(self) -> list:
+        """
+        Convert to the FAT-1 JSON form, writing each range either as a list of IDs or as a
+        {"min": ..., "max": ...} dict, whichever serializes shorter.
+
+        :return: a list of ints and dicts
+        """
+
+        ids = []
+        for start, end in self.ranges():
+            compact = {"min": start, "max": end}
+            # Each listed ID takes at least two characters with its comma, so long ranges are never expanded.
+            width = len(json.dumps(compact, separators=(",", ":"))) + 1
+            count = end - start + 1
+            if 2 * count <= width and sum(len(str(i)) + 1 for i in range(start, end + 1)) <= width:
+                ids.extend(range(start, end + 1))
+            else:
+                ids.append(compact)
+        return ids
+
+
+__all__ = ["RangeSet"]
@@ -1,8 +1,12 @@
-import json
-import hashlib
+import math
 from datetime import datetime as dt, timezone as tz
 from typing import List, Tuple, Union
 from fat.errors import InvalidParam, InvalidChainID, InvalidTransaction
+from fat.addresses import canonical_address
+from fat.encoding import encode_content
+from fat.signing import ext_ids_size, get_signers, keyring, sign_entry
+from fat.fat1.rangeset import RangeSet
+from factom_core.block_elements import Entry
 from factom_keys.fct import FactoidPrivateKey, FactoidAddress
 from factom_keys.serverid import ServerIDPrivateKey
 
@@ -10,6 +14,9 @@ from factom_keys.serverid import ServerIDPrivateKey
 class Transaction:
     def __init__(self, inputs=None, outputs=None, metadata=None, chain_id=None, signers=None):
         self._timestamp = str(int(dt.now(tz.utc).timestamp()))
+        self._built_content = None
+        self._ext_ids = None
+        self._content = None
 
         self.inputs = {}
         self.outputs = {}
@@ -32,30 +39,65 @@ class Transaction:
             for s in signers:
                 self.add_signer(s)
 
-    def add_input(self, address: Union[FactoidAddress, str], amount: list) -> None:
+    # The built content is cached until inputs, outputs or metadata change. Those changes, and adding a signer or
+    # setting the chain ID, also drop the signature, so the transaction must be signed again. Changing the inputs
+    # or outputs dicts in place isn't seen; use add_input and add_output, or assign a new dict, whose token IDs
+    # are validated as by add_input and add_output.
+    @property
+    def inputs(self) -> dict:
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, inputs: dict):
+        self._inputs = {
+            self.validate_address(address): self.validate_amount(ids) for address, ids in inputs.items()
+        }
+        self._built_content = self._ext_ids = self._content = None
+
+    @property
+    def outputs(self) -> dict:
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self, outputs: dict):
+        self._outputs = {
+            self.validate_address(address): self.validate_amount(ids) for address, ids in outputs.items()
+        }
+        self._built_content = self._ext_ids = self._content = None
+
+    @property
+    def metadata(self):
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata):
+        self._metadata = metadata
+        self._built_content = self._ext_ids = self._content = None
+
+    def add_input(self, address: Union[FactoidAddress, str], amount: Union[list, RangeSet]) -> None:
         """
-        Create an input entry from an address and amount.
+        Create an input entry from an address and the token IDs it sends.
 
         :param address: the factoid input address as a str or FactoidAddress object
-        :param amount: the factoid input amount as a n int
+        :param amount: the token IDs as a RangeSet, or a list of ints and {"min": ..., "max": ...} dicts
         """
 
         address = Transaction.validate_address(address)
-        self.validate_amount(amount)
-        self.inputs[address] = amount
+        self.inputs[address] = self.validate_amount(amount)
+        self._built_content = self._ext_ids = self._content = None
         return self
 
-    def add_output(self, address: Union[FactoidAddress, str], amount: list) -> None:
+    def add_output(self, address: Union[FactoidAddress, str], amount: Union[list, RangeSet]) -> None:
         """
-        Create an output entry from an address and amount.
+        Create an output entry from an address and the token IDs it receives.
 
         :param address: the factoid output address as a str or FactoidAddress object
-        :param amount: the factoid output amount as a n int
+        :param amount: the token IDs as a RangeSet, or a list of ints and {"min": ..., "max": ...} dicts
         """
 
         address = Transaction.validate_address(address)
-        self.validate_amount(amount)
-        self.outputs[address] = amount
+        self.outputs[address] = self.validate_amount(amount)
+        self._built_content = self._ext_ids = self._content = None
         return self
 
     def add_signer(self, signer: Union[FactoidPrivateKey, ServerIDPrivateKey, str]) -> None:
@@ -66,6 +108,7 @@ class Transaction:
         """
 
         self.signers.append(self.validate_signer(signer))
+        self._ext_ids = self._content = None
         return self
 
     def set_metadata(self, data: dict) -> None:
@@ -88,6 +131,7 @@ class Transaction:
         if not isinstance(chain_id, str):
             raise InvalidChainID
         self.chain_id = chain_id
+        self._ext_ids = self._content = None
         return self
 
     @staticmethod
@@ -98,22 +142,19 @@ class Transaction:
         :param address: a Factoid address as a str or a FactoidAddress object
         """
 
-        if isinstance(address, FactoidAddress):
-            address = address.to_string()
-        elif isinstance(address, str):
-            address = FactoidAddress(address_string=address).to_string()
-        else:
-            raise InvalidParam("Invalid address!")
-        return address
+        return canonical_address(address)
 
     @staticmethod
-    def validate_amount(amount: list):
-        if not isinstance(amount, list):
-            raise InvalidParam("Invalid amount!")
+    def validate_amount(amount: Union[list, RangeSet]) -> RangeSet:
+        """
+        Validate a list of token IDs and convert it to a RangeSet.
+
+        :param amount: the token IDs as a RangeSet, or a list of ints and {"min": ..., "max": ...} dicts
+        """
 
-        for entry in amount:
-            if not (isinstance(entry, dict) or isinstance(entry, int)):
-                raise InvalidParam("Invalid amount!")
+        if isinstance(amount, RangeSet):
+            return RangeSet(amount)
+        return RangeSet.from_json(amount)
 
     def validate_signer(
         self, signer: Union[FactoidPrivateKey, ServerIDPrivateKey, str]
@@ -158,6 +199,17 @@ class Transaction:
         if not self.chain_id:
             return False
 
+        # Check that the inputs and the outputs each hold a token ID at most once, and move the same token IDs.
+        # This works on ranges, so large ranges of IDs are never expanded.
+        try:
+            inputs = RangeSet.disjoint_union(self.inputs.values())
+            outputs = RangeSet.disjoint_union(self.outputs.values())
+        except InvalidParam:
+            return False
+
+        if not inputs == outputs:
+            return False
+
         return True
 
     def is_mint(self) -> bool:
@@ -171,51 +223,67 @@ class Transaction:
 
     def build_content(self) -> dict:
         """
-        Build entry content.
+        Build entry content as whitespace-free JSON, cached until the inputs, outputs or metadata change.
 
         :return: entry content as bytes.
         """
 
-        content = {}
+        if self._built_content is None:
+            # Token IDs are written in the most compact mix of IDs and ranges.
+            inputs = {address: ids.to_json() for address, ids in self.inputs.items()}
+            outputs = {address: ids.to_json() for address, ids in self.outputs.items()}
+            self._built_content = encode_content(inputs, outputs, self.metadata)
+        return self._built_content
 
-        content["inputs"] = self.inputs
-        content["outputs"] = self.outputs
+    def size(self) -> int:
+        """
+        Calculate the size of the signed entry as Factom counts it: the content, and the ext_ids of the timestamp
+        and every signer with their 2 byte lengths.
 
-        if self.metadata:
-            content["metadata"] = self.metadata
+        :return: the entry payload size in bytes as an int
+        """
 
-        # Including separators removes whitespace.
-        return json.dumps(content, separators=(",", ":")).encode()
+        return len(self.build_content()) + ext_ids_size(self._timestamp, len(self.signers))
 
-    def sign(self) -> Tuple[List[bytes], bytes]:
+    def ec_cost(self) -> int:
+        """
+        Calculate the number of entry credits the signed entry costs, 1 for each started KB of its size.
+
+        :return: the number of entry credits as an int
+        """
+
+        # 1 EC for each started KB of the entry payload.
+        return math.ceil(self.size() / 1024)
+
+    def sign(self, keyring=keyring) -> Tuple[List[bytes], bytes]:
         """
         Sign transaction and create ext_ids and content.
 
+        :param keyring: the Keyring to look the signing keys up in, or None not to cache them
         :return: a tuple of the extids and the content: ([extids], content)
         """
 
         if not self.is_valid():
             raise InvalidTransaction
 
-        ext_ids = [self._timestamp.encode()]
+        timestamp = self._timestamp.encode()
         content = self.build_content()
         chain_id = bytes.fromhex(self.chain_id)
 
-        for i, signer in enumerate(self.signers):
-            # Create message hash
-            message = bytearray()
-            message.extend(str(i).encode())
-            message.extend(self._timestamp.encode())
-            message.extend(chain_id)
-            message.extend(content)
-            message_hash = hashlib.sha512(message).digest()
-
-            # Get and append rcd and signature
-            if self.is_mint():
-                ext_ids.append(b"\x01" + signer.get_public_key().key_bytes)
-            else:
-                ext_ids.append(b"\x01" + signer.get_factoid_address().key_bytes)
-            ext_ids.append(signer.sign(message_hash))
+        # The RCD of each key is computed once and cached in the keyring, unless keyring is None.
+        signers = get_signers(self.signers, keyring)
+        ext_ids = [timestamp] + sign_entry(timestamp, chain_id, content, signers)
 
         self._ext_ids = ext_ids
         self._content = content
+
+    def entry_hash(self) -> str:
+        """
+        Compute the Factom entry hash of the signed transaction, the hash fatd returns when it is submitted.
+
+        :return: the entry hash as a hex str
+        """
+
+        if self._ext_ids is None:
+            raise InvalidTransaction(message="Transaction has not been signed!")
+        return Entry(bytes.fromhex(self.chain_id), self._ext_ids, self._content).entry_hash.hex()
@@ -0,0 +1,274 @@
+import json
+import sqlite3
+import threading
+from .errors import TransactionNotFound
+
+COINBASE_ADDRESS = "FA1zT4aFpEvcnPqPCigB3fvGu4Q4mTXY22iiuV69DqE1pNhdF2MC"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    chain_id TEXT PRIMARY KEY,
+    last_entry_hash TEXT,
+    last_timestamp INTEGER NOT NULL DEFAULT 0,
+    transactions INTEGER NOT NULL DEFAULT 0,
+    minted INTEGER NOT NULL DEFAULT 0,
+    burned INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    chain_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    entry_hash TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (chain_id, seq)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_entry_hash ON transactions (chain_id, entry_hash);
+CREATE TABLE IF NOT EXISTS transfers (
+    chain_id TEXT NOT NULL,
+    address TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    amount INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transfers_address ON transfers (chain_id, address, seq);
+CREATE TABLE IF NOT EXISTS balances (
+    chain_id TEXT NOT NULL,
+    address TEXT NOT NULL,
+    balance INTEGER NOT NULL,
+    PRIMARY KEY (chain_id, address)
+);
+"""
+
+
+def token_count(amount) -> int:
+    """
+    :param amount: a FAT-0 amount, or a FAT-1 list of token IDs and {"min": ..., "max": ...} ranges
+    :return: the number of tokens moved
+    """
+
+    if isinstance(amount, int):
+        return amount
+    return sum(1 if isinstance(i, int) else i["max"] - i["min"] + 1 for i in amount)
+
+
+class TokenIndex:
+    def __init__(self, fatd, path=":memory:", chain_id=None, token_id=None, issuer_id=None, page_size=1000):
+        """
+        A local SQLite mirror of a token's transaction history.
+
+        sync() fetches only the transactions added since the last sync, starting from the last indexed entry hash.
+        Balances, per-address history and stats are then answered from the database without calling fatd.
+        One database file can hold the indexes of several tokens.
+
+        :param fatd: the FATd client used to sync
+        :param path: the path of the database file
+        :param chain_id: the chain ID of the token, or token_id and issuer_id
+        :param page_size: the number of transactions fetched per request, and written per database transaction
+        """
+
+        if chain_id is None:
+            chain_id = fatd.get_issuance(token_id=token_id, issuer_id=issuer_id)["result"]["chainid"]
+
+        self.fatd = fatd
+        self.path = path
+        self.chain_id = chain_id
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.executescript(SCHEMA)
+            self._db.execute("INSERT OR IGNORE INTO tokens (chain_id) VALUES (?)", (chain_id,))
+
+    def __len__(self):
+        return self._state()[2]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def last_entry_hash(self):
+        return self._state()[0]
+
+    def sync(self) -> int:
+        """
+        Index the transactions added since the last sync.
+
+        Transactions are committed one page at a time, so an interrupted sync resumes where it stopped.
+
+        :return: the number of transactions added
+        """
+
+        last_entry_hash = self.last_entry_hash
+        transactions = self.fatd.iter_transactions(
+            chain_id=self.chain_id, entry_hash=last_entry_hash, limit=self.page_size, order="asc"
+        )
+
+        added = 0
+        page = []
+        try:
+            for tx in transactions:
+                # The query starts at, and includes, the last indexed transaction.
+                if tx["entryhash"] == last_entry_hash:
+                    continue
+                page.append(tx)
+                if len(page) == self.page_size:
+                    added += self._add(page)
+                    page = []
+        except TransactionNotFound:
+            # fatd answers a query for a token without transactions with an error.
+            if last_entry_hash is not None:
+                raise
+        added += self._add(page)
+        return added
+
+    def _add(self, transactions) -> int:
+        if not transactions:
+            return 0
+
+        with self._lock, self._db:
+            _, _, seq, minted, burned = self._db.execute(
+                "SELECT last_entry_hash, last_timestamp, transactions, minted, burned FROM tokens "
+                "WHERE chain_id = ?",
+                (self.chain_id,),
+            ).fetchone()
+
+            rows = []
+            transfers = []
+            deltas = {}
+            for tx in transactions:
+                data = tx["data"]
+                rows.append((self.chain_id, seq, tx["entryhash"], tx["timestamp"], json.dumps(data)))
+                for address, amount in data["inputs"].items():
+                    amount = token_count(amount)
+                    if address == COINBASE_ADDRESS:
+                        minted += amount
+                        continue
+                    transfers.append((self.chain_id, address, seq, -amount))
+                    deltas[address] = deltas.get(address, 0) - amount
+                for address, amount in data["outputs"].items():
+                    amount = token_count(amount)
+                    if address == COINBASE_ADDRESS:
+                        burned += amount
+                        continue
+                    transfers.append((self.chain_id, address, seq, amount))
+                    deltas[address] = deltas.get(address, 0) + amount
+                seq += 1
+
+            self._db.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?)", rows)
+            self._db.executemany("INSERT INTO transfers VALUES (?, ?, ?, ?)", transfers)
+            # Balances are only touched once per address per page, however many transactions moved it.
+            self._db.executemany(
+                "INSERT INTO balances VALUES (?, ?, ?) "
+                "ON CONFLICT (chain_id, address) DO UPDATE SET balance = balance + excluded.balance",
+                [(self.chain_id, address, delta) for address, delta in deltas.items()],
+            )
+            last = transactions[-1]
+            self._db.execute(
+                "UPDATE tokens SET last_entry_hash = ?, last_timestamp = ?, transactions = ?, minted = ?, "
+                "burned = ? WHERE chain_id = ?",
+                (last["entryhash"], last["timestamp"], seq, minted, burned, self.chain_id),
+            )
+        return len(transactions)
+
+    def _state(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT last_entry_hash, last_timestamp, transactions, minted, burned FROM tokens "
+                "WHERE chain_id = ?",
+                (self.chain_id,),
+            ).fetchone()
+
+    def balance(self, address: str) -> int:
+        """
+        :param address: a Factoid address
+        :return: the balance of the address, as of the last sync. FAT-1 balances are token counts.
+        """
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT balance FROM balances WHERE chain_id = ? AND address = ?", (self.chain_id, address)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def balances(self) -> dict:
+        """
+        :return: the non-zero balances of all addresses, as of the last sync
+        """
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT address, balance FROM balances WHERE chain_id = ? AND balance != 0", (self.chain_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def transaction(self, entry_hash: str):
+        """
+        :param entry_hash: the entry hash of a transaction
+        :return: the transaction dict, as returned by get-transaction, or None if it isn't indexed
+        """
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT entry_hash, timestamp, data FROM transactions WHERE chain_id = ? AND entry_hash = ?",
+                (self.chain_id, entry_hash),
+            ).fetchone()
+        return TokenIndex._transaction(row) if row else None
+
+    def history(self, address: str, to_from=None, limit=None, offset=0, order="asc") -> list:
+        """
+        Get the transactions of an address, in time order.
+
+        :param address: a Factoid address
+        :param to_from: "to" for only incoming, "from" for only outgoing transactions, or None for both
+        :param limit: the maximum number of transactions returned
+        :param offset: the number of transactions skipped
+        :param order: "asc" or "desc"
+        :return: a list of transaction dicts, as returned by get-transactions
+        """
+
+        if order not in ("asc", "desc"):
+            raise ValueError("Order must be 'asc' or 'desc'!")
+
+        direction = {None: "", "to": " AND amount > 0", "from": " AND amount < 0"}[to_from]
+        query = (
+            "SELECT entry_hash, timestamp, data FROM transactions WHERE chain_id = ? AND seq IN "
+            "(SELECT seq FROM transfers WHERE chain_id = ? AND address = ?{}) "
+            "ORDER BY seq {} LIMIT ? OFFSET ?".format(direction, order.upper())
+        )
+        with self._lock:
+            rows = self._db.execute(
+                query, (self.chain_id, self.chain_id, address, -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [TokenIndex._transaction(row) for row in rows]
+
+    def stats(self) -> dict:
+        """
+        :return: the supply and transaction statistics of the token, as of the last sync, named as in get-stats
+        """
+
+        _, last_timestamp, transactions, minted, burned = self._state()
+        with self._lock:
+            holders = self._db.execute(
+                "SELECT COUNT(*) FROM balances WHERE chain_id = ? AND balance != 0", (self.chain_id,)
+            ).fetchone()[0]
+        return {
+            "chainid": self.chain_id,
+            "circulating": minted - burned,
+            "burned": burned,
+            "transactions": transactions,
+            "lasttxts": last_timestamp,
+            "nonzerobalances": holders,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _transaction(row):
+        return {"entryhash": row[0], "timestamp": row[1], "data": json.loads(row[2])}
+
+
+__all__ = ["TokenIndex", "token_count"]
@@ -0,0 +1,135 @@
+import bisect
+import threading
+from collections import Counter
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Observer:
+    """
+    Base class for objects that are notified of every HTTP request a client makes.
+
+    Register observers with the `observers` argument of FATd or with FATd.add_observer().
+    """
+
+    def record(self, method: str, latency: float, request_size: int, response_size: int, error=None):
+        """
+        Called once for every completed HTTP request.
+
+        :param method: the RPC method name, or "batch" for a JSON-RPC batch request
+        :param latency: the time taken by the request in seconds
+        :param request_size: the size of the request body in bytes
+        :param response_size: the size of the response body in bytes
+        :param error: the exception the request failed with, or None if it succeeded
+        """
+
+        pass
+
+
+class MethodStats:
+    def __init__(self):
+        """Request statistics for a single RPC method."""
+        self.count = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.errors = Counter()
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a latency percentile from the histogram.
+
+        :param q: the percentile as a fraction between 0 and 1
+        :return: the upper bound of the bucket the percentile falls into, in seconds
+        """
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.latency_buckets):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "latency_sum": self.latency_sum,
+            "latency_buckets": dict(zip([*LATENCY_BUCKETS, float("inf")], self.latency_buckets)),
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "errors": dict(self.errors),
+        }
+
+
+class Metrics(Observer):
+    def __init__(self):
+        """
+        An Observer that keeps per-method latency histograms, byte counts and error counts.
+
+        Errors are counted by exception class name, e.g. "TokenSyncing" or "ConnectionError".
+        """
+
+        self.methods = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, latency, request_size, response_size, error=None):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, latency)
+        with self._lock:
+            stats = self.methods.get(method)
+            if stats is None:
+                stats = self.methods[method] = MethodStats()
+            stats.count += 1
+            stats.latency_sum += latency
+            stats.latency_buckets[bucket] += 1
+            stats.request_bytes += request_size
+            stats.response_bytes += response_size
+            if error is not None:
+                stats.errors[type(error).__name__] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Get a copy of the current statistics.
+
+        :return: a dict of RPC method name to a dict of statistics
+        """
+
+        with self._lock:
+            return {method: stats.to_dict() for method, stats in self.methods.items()}
+
+    def reset(self):
+        with self._lock:
+            self.methods = {}
+
+    def dump(self, prefix: str = "fatd_client") -> str:
+        """
+        Render the current statistics in the Prometheus text exposition format.
+
+        :param prefix: the prefix of all metric names
+        :return: the metrics as a str
+        """
+
+        lines = []
+        for method, stats in sorted(self.snapshot().items()):
+            label = 'method="{}"'.format(method)
+            cumulative = 0
+            for bound, count in stats["latency_buckets"].items():
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append('{}_latency_seconds_bucket{{{},le="{}"}} {}'.format(prefix, label, le, cumulative))
+            lines.append("{}_latency_seconds_sum{{{}}} {}".format(prefix, label, stats["latency_sum"]))
+            lines.append("{}_latency_seconds_count{{{}}} {}".format(prefix, label, stats["count"]))
+            lines.append("{}_request_bytes_total{{{}}} {}".format(prefix, label, stats["request_bytes"]))
+            lines.append("{}_response_bytes_total{{{}}} {}".format(prefix, label, stats["response_bytes"]))
+            for error, count in sorted(stats["errors"].items()):
+                lines.append('{}_errors_total{{{},error="{}"}} {}'.format(prefix, label, error, count))
+        return "\n".join(lines) + "\n"
+
+
+__all__ = ["LATENCY_BUCKETS", "Observer", "MethodStats", "Metrics"]
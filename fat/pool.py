@@ -0,0 +1,189 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .client import FATd, WRITE_METHODS
+from .errors import FATdAPIError, MissingRequiredParameter
+
+
+class PoolNode:
+    def __init__(self, client: FATd):
+        """The health and latency state of a single fatd node in a FATdPool."""
+        self.client = client
+        self.healthy = True
+        self.latency = None
+        self.sync_height = None
+        self.factom_height = None
+        self.properties = None
+        self.last_error = None
+
+    @property
+    def host(self):
+        return self.client.host
+
+    def record_latency(self, latency: float, weight: float = 0.3):
+        # Exponentially weighted moving average, so a single slow request doesn't dominate routing.
+        self.latency = latency if self.latency is None else (1 - weight) * self.latency + weight * latency
+
+    def __repr__(self):
+        return "PoolNode(host={!r}, healthy={}, latency={})".format(self.host, self.healthy, self.latency)
+
+
+class FATdPool(FATd):
+    def __init__(
+        self,
+        hosts,
+        primary=None,
+        max_lag=2,
+        health_interval=30.0,
+        health_timeout=5.0,
+        ec_address=None,
+        fct_address=None,
+        username=None,
+        password=None,
+        certfile=None,
+        **kwargs
+    ):
+        """
+        A FATd client that spreads requests over several fatd nodes.
+
+        Reads go to the healthy node with the lowest latency and fail over to the next one on connection errors.
+        Writes (send-transaction) always go to the primary node. Nodes are health checked at most once per
+        health_interval with get-sync-status; nodes that fail or lag behind are skipped until they recover. The
+        periodic health check runs on a background thread and checks all nodes concurrently, so a stalled node
+        never holds up requests or the checks of the other nodes.
+
+        Args:
+            hosts (list): Hostnames, including http(s)://, of the nodes.
+            primary (str): Host writes are sent to. Defaults to the first host.
+            max_lag (int): Number of blocks a node may lag behind the Factom
+                height or the most synced node before it is skipped.
+            health_interval (float): Minimum number of seconds between
+                health checks.
+            health_timeout (float or tuple): Timeout in seconds of each
+                health check request, or a (connect, read) tuple. Applies
+                even when requests have no timeout.
+            See FATd for the remaining arguments. Caching, observers and
+            retries apply to the pool as a whole.
+        """
+
+        if not hosts:
+            raise MissingRequiredParameter("Requires at least one host.")
+
+        primary = primary or hosts[0]
+        if primary not in hosts:
+            raise MissingRequiredParameter("The primary must be one of the hosts.")
+
+        super().__init__(ec_address, fct_address, primary, username, password, certfile, **kwargs)
+        self.max_lag = max_lag
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.nodes = [
+            PoolNode(
+                FATd(
+                    host=host,
+                    username=username,
+                    password=password,
+                    certfile=certfile,
+                    cache=False,
+                    coalesce=False,
+                    observers=self.observers,
+                    codec=self.codec,
+                    pool_connections=self.session.pool_connections,
+                    pool_maxsize=self.session.pool_maxsize,
+                    timeout=self.session.timeout,
+                    keep_alive=self.session.keep_alive,
+                )
+            )
+            for host in hosts
+        ]
+        self.primary = self.nodes[hosts.index(primary)]
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def check_health(self):
+        """
+        Health check every node now, concurrently, measuring its latency and sync status.
+
+        :return: the list of healthy nodes
+        """
+
+        with ThreadPoolExecutor(max_workers=len(self.nodes)) as executor:
+            list(executor.map(self._check_node, self.nodes))
+
+        synced = [node.sync_height for node in self.nodes if node.healthy]
+        best = max(synced) if synced else None
+        for node in self.nodes:
+            if node.healthy and (
+                node.factom_height - node.sync_height > self.max_lag or best - node.sync_height > self.max_lag
+            ):
+                node.healthy = False
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+        return self.healthy_nodes()
+
+    def _check_node(self, node):
+        started = time.perf_counter()
+        try:
+            if node.properties is None:
+                node.properties = self._node_call(node, "get-daemon-properties")["result"]
+            status = self._node_call(node, "get-sync-status")["result"]
+        except (FATdAPIError,) + self.transport_errors as error:
+            node.healthy = False
+            node.last_error = error
+            return
+
+        node.record_latency(time.perf_counter() - started)
+        node.sync_height = status["syncheight"]
+        node.factom_height = status["factomheight"]
+        node.healthy = True
+        node.last_error = None
+
+    def healthy_nodes(self):
+        """
+        :return: the healthy nodes, fastest first
+        """
+
+        healthy = [node for node in self.nodes if node.healthy]
+        return sorted(healthy, key=lambda node: float("inf") if node.latency is None else node.latency)
+
+    def _claim_health_check(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < self.health_interval:
+                return False
+            self._checked_at = now
+            return True
+
+    def _post_once(self, method, data, raw=False):
+        if self._claim_health_check():
+            # Requests keep using the last known node health while the check runs.
+            threading.Thread(target=self.check_health, daemon=True).start()
+
+        calls = data if isinstance(data, list) else [data]
+        if any(call["method"] in WRITE_METHODS for call in calls):
+            return self.primary.client._post_once(method, data, raw)
+
+        # Fall back to the unhealthy nodes when no node is healthy.
+        candidates = self.healthy_nodes() or self.nodes
+        for i, node in enumerate(candidates):
+            started = time.perf_counter()
+            try:
+                body = node.client._post_once(method, data, raw)
+            except self.transport_errors as error:
+                node.healthy = False
+                node.last_error = error
+                if i == len(candidates) - 1:
+                    raise
+                continue
+
+            node.record_latency(time.perf_counter() - started)
+            return body
+
+    def _node_call(self, node, method):
+        # Bypasses the pool's routing, caches and retries.
+        call = {"jsonrpc": "2.0", "id": 0, "method": method}
+        return node.client._post_once(method, call, timeout=self.health_timeout)
+
+
+__all__ = ["FATdPool", "PoolNode"]
@@ -1,16 +1,39 @@
+import random
 from base64 import b64encode
 from requests import Session
+from requests.adapters import HTTPAdapter
+from .errors import FATdAPIError, TokenSyncing
 
 
 class APISession(Session):
-    def __init__(self):
+    def __init__(self, pool_connections=10, pool_maxsize=10, timeout=None, keep_alive=True):
         """
         Creates a new CoreAPISession instance.
+
+        :param pool_connections: the number of hosts to keep connection pools for
+        :param pool_maxsize: the maximum number of connections kept open per host
+        :param timeout: the default timeout of requests in seconds, either a float or a (connect, read) tuple
+        :param keep_alive: reuse connections between requests
         """
         super(APISession, self).__init__()
 
         self.headers.update({"Accept-Charset": "utf-8", "Content-Type": "text/plain"})
 
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        if not keep_alive:
+            self.headers.update({"Connection": "close"})
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super(APISession, self).request(method, url, **kwargs)
+
     def init_basic_auth(self, username, password):
         credentials = b64encode("{}:{}".format(username, password).encode())
         self.headers.update({"Authorization": "Basic {}".format(credentials.decode())})
@@ -19,4 +42,103 @@ class APISession(Session):
         self.verify = certfile
 
 
-__all__ = ["APISession"]
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries=3,
+        backoff=0.1,
+        max_backoff=5.0,
+        jitter=True,
+        retry_errors=(TokenSyncing,),
+        retry_transport_errors=True,
+        never_retry=("send-transaction",),
+    ):
+        """
+        Decides which failed requests are retried and how long to wait in between.
+
+        Delays grow exponentially from `backoff` up to `max_backoff`. With jitter, each delay is drawn uniformly
+        between 0 and that bound so that many clients retrying at once spread out.
+
+        :param max_retries: the maximum number of retries after the first attempt
+        :param backoff: the bound of the first delay in seconds
+        :param max_backoff: the largest bound of any delay in seconds
+        :param jitter: randomize the delays
+        :param retry_errors: the FATdAPIError subclasses that are retried
+        :param retry_transport_errors: retry connection errors and timeouts
+        :param never_retry: RPC methods that are never retried because they are not idempotent
+        """
+
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_errors = tuple(retry_errors)
+        self.retry_transport_errors = retry_transport_errors
+        self.never_retry = frozenset(never_retry)
+
+    def should_retry(self, method: str, error: Exception, attempt: int) -> bool:
+        """
+        :param method: the RPC method name of the failed request
+        :param error: the exception the request failed with
+        :param attempt: the number of retries made so far
+        :return: whether the request should be retried
+        """
+
+        if attempt >= self.max_retries or method in self.never_retry:
+            return False
+        if isinstance(error, FATdAPIError):
+            return isinstance(error, self.retry_errors)
+        return self.retry_transport_errors
+
+    def delay(self, attempt: int) -> float:
+        """
+        :param attempt: the number of retries made so far
+        :return: the number of seconds to wait before the next retry
+        """
+
+        bound = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, bound) if self.jitter else bound
+
+
+class AdaptiveWindow:
+    def __init__(self, initial=8, minimum=1, maximum=64, decrease=0.5, slow_factor=3.0):
+        """
+        An additive increase, multiplicative decrease (AIMD) limit on the number of requests in flight.
+
+        Every success grows the limit by about one per full window, up to `maximum`. A failure, or a response
+        taking more than `slow_factor` times the smoothed latency, shrinks it by `decrease`, down to `minimum`.
+
+        :param initial: the starting limit
+        :param minimum: the smallest limit
+        :param maximum: the largest limit
+        :param decrease: the factor the limit is multiplied by on congestion
+        :param slow_factor: how many times slower than the smoothed latency a response is considered congestion
+        """
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.latency = None
+        self._limit = float(max(minimum, min(initial, maximum)))
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def success(self, latency: float):
+        """
+        :param latency: the number of seconds the request took
+        """
+
+        if self.latency is not None and latency > self.slow_factor * self.latency:
+            self.failure()
+        else:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+
+    def failure(self):
+        self._limit = max(self.minimum, self._limit * self.decrease)
+
+
+__all__ = ["APISession", "RetryPolicy", "AdaptiveWindow"]
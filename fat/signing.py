@@ -0,0 +1,189 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+from factom_keys.serverid import ServerIDPrivateKey
+from .cache import LRUCache
+from .errors import InvalidTransaction
+
+# Bytes of ext_ids each signer adds to an entry: a 33 byte RCD and a 64 byte signature.
+SIGNER_EXT_IDS_SIZE = 33 + 64
+# Factom stores every ext_id after a 2 byte length, which counts towards the entry size.
+EXT_ID_LENGTH_SIZE = 2
+
+
+class Signer:
+    __slots__ = ("key", "public_key", "rcd", "sign")
+
+    def __init__(self, key):
+        """
+        A signing key with its public key and RCD computed once.
+
+        :param key: a FactoidPrivateKey, or a ServerIDPrivateKey for signing mint transactions
+        """
+
+        self.key = key
+        if isinstance(key, ServerIDPrivateKey):
+            self.public_key = key.get_public_key().key_bytes
+        else:
+            self.public_key = key.get_factoid_address().key_bytes
+        # A type 1 RCD is the public key prefixed with its type.
+        self.rcd = b"\x01" + self.public_key
+        self.sign = key.sign
+
+
+class Keyring:
+    def __init__(self, maxsize: int = 1024):
+        """
+        Caches the Signers of recently used private keys.
+
+        Transactions look their signers up here, so a hot wallet key signing many transactions derives its public
+        key only once.
+
+        :param maxsize: the maximum number of keys held
+        """
+
+        self._signers = LRUCache(maxsize)
+
+    def __len__(self):
+        return len(self._signers)
+
+    def signer(self, key) -> Signer:
+        """
+        :param key: a FactoidPrivateKey or ServerIDPrivateKey
+        :return: the cached Signer of the key
+        """
+
+        cache_key = (type(key), key.key_bytes)
+        signer = self._signers.get(cache_key)
+        if signer is None:
+            signer = Signer(key)
+            self._signers.set(cache_key, signer)
+        return signer
+
+    def clear(self):
+        """Drop every cached Signer, and with it the private keys they hold."""
+
+        self._signers.clear()
+
+
+def ext_ids_size(timestamp: str, num_signers: int) -> int:
+    """
+    Calculate the size Factom counts for the ext_ids of a signed transaction.
+
+    :param timestamp: the transaction timestamp
+    :param num_signers: the number of signers
+    :return: the size of the timestamp, RCD and signature ext_ids and their lengths, in bytes
+    """
+
+    num_ext_ids = 1 + 2 * num_signers
+    return len(timestamp) + num_signers * SIGNER_EXT_IDS_SIZE + num_ext_ids * EXT_ID_LENGTH_SIZE
+
+
+# The keyring Transaction.sign uses by default.
+keyring = Keyring()
+
+
+def get_signers(keys, keyring=keyring) -> List[Signer]:
+    """
+    :param keys: FactoidPrivateKeys or ServerIDPrivateKeys
+    :param keyring: the Keyring to look the keys up in, or None to build their Signers without caching them
+    :return: the Signers of the keys, in order
+    """
+
+    if keyring is None:
+        return [Signer(key) for key in keys]
+    return [keyring.signer(key) for key in keys]
+
+
+def sign_entry(timestamp: bytes, chain_id: bytes, content: bytes, signers) -> List[bytes]:
+    """
+    Sign the content of a FAT transaction entry.
+
+    Signer i signs the SHA-512 hash of str(i) + timestamp + chain_id + content. The content is fed to the hash
+    in place rather than copied into a message per signer.
+
+    :param timestamp: the transaction timestamp, the first ext_id
+    :param chain_id: the chain ID as bytes
+    :param content: the entry content
+    :param signers: the Signers, in input order
+    :return: the RCD and signature ext_ids of all signers
+    """
+
+    ext_ids = []
+    for i, signer in enumerate(signers):
+        message = hashlib.sha512(str(i).encode())
+        message.update(timestamp)
+        message.update(chain_id)
+        message.update(content)
+        ext_ids.append(signer.rcd)
+        ext_ids.append(signer.sign(message.digest()))
+    return ext_ids
+
+
+# The Signers of a worker process, set once by _init_worker.
+_signers = None
+
+
+def _init_worker(keys):
+    global _signers
+    _signers = [Signer(key_class(seed_bytes=seed)) for key_class, seed in keys]
+
+
+def _sign(task, signers=None) -> List[bytes]:
+    timestamp, chain_id, content, signer_ids = task
+    signers = _signers if signers is None else signers
+    return sign_entry(timestamp, chain_id, content, [signers[i] for i in signer_ids])
+
+
+def sign_many(transactions, processes=None, chunksize=64, keyring=keyring) -> List[Tuple[List[bytes], bytes]]:
+    """
+    Sign many fat0 or fat1 transactions in parallel on a pool of processes.
+
+    Each distinct signing key is sent to the workers once, when they start, and tasks refer to keys by index, so
+    only the content, timestamp and chain ID of each transaction are pickled. Every transaction is left signed, as
+    if its sign() method had been called.
+
+    :param transactions: an iterable of Transaction objects
+    :param processes: the number of worker processes; defaults to the number of CPUs. With 1, signing is done
+        in the calling process.
+    :param chunksize: the number of transactions sent to a worker at a time
+    :param keyring: the Keyring that signing in the calling process looks keys up in, or None not to cache them
+    :return: the (ext_ids, content) tuple of every transaction, in order
+    """
+
+    transactions = list(transactions)
+    keys = []
+    key_ids = {}
+    tasks = []
+    for tx in transactions:
+        if not tx.is_valid():
+            raise InvalidTransaction
+
+        signer_ids = []
+        for signer in tx.signers:
+            key = (type(signer), signer.key_bytes)
+            if key not in key_ids:
+                key_ids[key] = len(keys)
+                keys.append(key)
+            signer_ids.append(key_ids[key])
+        tasks.append((tx._timestamp.encode(), bytes.fromhex(tx.chain_id), tx.build_content(), tuple(signer_ids)))
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(tasks) <= chunksize:
+        signers = get_signers([key_class(seed_bytes=seed) for key_class, seed in keys], keyring)
+        signatures = [_sign(task, signers) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(keys,)) as executor:
+            signatures = list(executor.map(_sign, tasks, chunksize=chunksize))
+
+    signed = []
+    for tx, task, ext_ids in zip(transactions, tasks, signatures):
+        tx._ext_ids = [task[0]] + ext_ids
+        tx._content = task[2]
+        signed.append((tx._ext_ids, tx._content))
+    return signed
+
+
+__all__ = ["SIGNER_EXT_IDS_SIZE", "EXT_ID_LENGTH_SIZE", "ext_ids_size", "Signer", "Keyring", "keyring",
+           "get_signers", "sign_entry", "sign_many"]
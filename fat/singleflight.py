@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesces concurrent calls with the same key into a single call.
+
+        While a call for a key is in flight, other callers with the same key wait for it and receive its
+        result, or its exception, instead of making their own call.
+        """
+
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Call fn, or wait for the in-flight call with the same key.
+
+        :param key: a hashable key identifying the call
+        :param fn: a function taking no arguments
+        :return: the result of fn
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        """Coalesces concurrent coroutine calls with the same key into a single call. See SingleFlight."""
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, fn):
+        """
+        Await fn(), or the in-flight call with the same key.
+
+        :param key: a hashable key identifying the call
+        :param fn: a function taking no arguments and returning an awaitable
+        :return: the result of the awaitable
+        """
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shield the shared call so one waiter being cancelled doesn't cancel it for everyone.
+            return await asyncio.shield(future)
+
+        future = self._calls[key] = asyncio.ensure_future(fn())
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._calls.pop(key, None)
+            else:
+                future.add_done_callback(lambda _: self._calls.pop(key, None))
+
+
+__all__ = ["SingleFlight", "AsyncSingleFlight"]
@@ -0,0 +1,375 @@
+import json
+import random
+import threading
+import time
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from factom_core.block_elements import Entry
+from factom_keys.fct import FactoidAddress
+
+COINBASE_ADDRESS = "FA1zT4aFpEvcnPqPCigB3fvGu4Q4mTXY22iiuV69DqE1pNhdF2MC"
+
+# JSON-RPC error codes used by fatd.
+INVALID_PARAMS = -32602
+METHOD_NOT_FOUND = -32601
+TOKEN_NOT_FOUND = -32800
+TRANSACTION_NOT_FOUND = -32803
+TOKEN_SYNCING = -32805
+
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        self.code = code
+        self.message = message
+
+
+class SyntheticToken:
+    def __init__(
+        self, token_id="synthetic", token_type="FAT-0", num_addresses=100, num_transactions=1000, seed=0
+    ):
+        """
+        A randomly generated token with a consistent transaction history, balances and stats.
+
+        FAT-0 histories mint amounts from the coinbase address and then move them between addresses. FAT-1
+        histories mint non-fungible token IDs and then move single tokens between addresses.
+
+        :param token_id: the token ID
+        :param token_type: "FAT-0" or "FAT-1"
+        :param num_addresses: the number of Factoid addresses holding the token
+        :param num_transactions: the number of transactions in the history
+        :param seed: the seed of the random generator, so datasets are repeatable
+        """
+
+        rng = random.Random(seed)
+        self.token_id = token_id
+        self.token_type = token_type
+        self.issuer_id = "888888" + "".join(rng.choice("0123456789abcdef") for _ in range(58))
+        self.chain_id = self._chain_id()
+        self.issuance_timestamp = 1570000000
+        self.issuance = {"type": token_type, "supply": -1, "symbol": "SYN"}
+        self.addresses = [
+            FactoidAddress(rcd_hash=bytes(rng.getrandbits(8) for _ in range(32))).to_string()
+            for _ in range(num_addresses)
+        ]
+
+        self.transactions = []
+        self.balances = {}
+        self.nf_tokens = {}
+        self.burned = 0
+        self.minted = 0
+        next_nf_id = 0
+        # Addresses with a non-zero balance, kept as a list so a random one can be picked in constant time.
+        holders = []
+        positions = {}
+        for i in range(num_transactions):
+            timestamp = self.issuance_timestamp + 60 * (i + 1)
+            mint = not holders or rng.random() < 0.2
+            receiver = rng.choice(self.addresses)
+
+            if token_type == "FAT-0":
+                if mint:
+                    sender, amount = COINBASE_ADDRESS, rng.randint(1, 1000000)
+                    self.minted += amount
+                else:
+                    sender = rng.choice(holders)
+                    amount = rng.randint(1, self.balances[sender])
+                    self.balances[sender] -= amount
+                self.balances[receiver] = self.balances.get(receiver, 0) + amount
+                data = {"inputs": {sender: amount}, "outputs": {receiver: amount}}
+            else:
+                if mint:
+                    count = rng.randint(1, 10)
+                    ids = list(range(next_nf_id, next_nf_id + count))
+                    next_nf_id += count
+                    sender = COINBASE_ADDRESS
+                    self.minted += count
+                else:
+                    sender = rng.choice(holders)
+                    ids = [rng.choice(self.balances[sender])]
+                    self.balances[sender].remove(ids[0])
+                self.balances.setdefault(receiver, []).extend(ids)
+                data = {"inputs": {sender: ids}, "outputs": {receiver: ids}}
+
+            for address in (sender, receiver):
+                if address == COINBASE_ADDRESS:
+                    continue
+                if self.balances[address] and address not in positions:
+                    positions[address] = len(holders)
+                    holders.append(address)
+                elif not self.balances[address] and address in positions:
+                    last = holders.pop()
+                    position = positions.pop(address)
+                    if last != address:
+                        holders[position] = last
+                        positions[last] = position
+
+            entry_hash = sha256("{}:{}".format(self.chain_id, i).encode()).hexdigest()
+            self.transactions.append({"entryhash": entry_hash, "timestamp": timestamp, "data": data})
+            if token_type == "FAT-1":
+                for nf_id in ids:
+                    token = self.nf_tokens.setdefault(
+                        nf_id, {"id": nf_id, "owner": receiver, "creationtx": entry_hash}
+                    )
+                    token["owner"] = receiver
+
+        self.by_entry_hash = {tx["entryhash"]: i for i, tx in enumerate(self.transactions)}
+
+    def _chain_id(self):
+        # Same derivation as Issuance.create_chain_id.
+        ext_ids = [b"token", self.token_id.encode(), b"issuer", bytes.fromhex(self.issuer_id)]
+        return sha256(b"".join(sha256(x).digest() for x in ext_ids)).hexdigest()
+
+    def balance(self, address):
+        balance = self.balances.get(address, 0 if self.token_type == "FAT-0" else [])
+        return balance if self.token_type == "FAT-0" else len(balance)
+
+    def stats(self):
+        return {
+            "chainid": self.chain_id,
+            "tokenid": self.token_id,
+            "issuerid": self.issuer_id,
+            "Issuance": self.issuance,
+            "circulating": self.minted - self.burned,
+            "burned": self.burned,
+            "transactions": len(self.transactions),
+            "issuancets": self.issuance_timestamp,
+            "lasttxts": self.transactions[-1]["timestamp"] if self.transactions else 0,
+        }
+
+
+class MockFATd:
+    def __init__(self, tokens=None, latency=0.0, error_rate=0.0, host="127.0.0.1", port=0, seed=None):
+        """
+        A local stand-in for fatd that serves the JSON-RPC API from synthetic in-memory tokens.
+
+        Runs an HTTP server on a background thread. Use it as a context manager, or call start() and stop():
+
+            with MockFATd([SyntheticToken(num_transactions=10000)], latency=0.02) as server:
+                fatd = FATd(host=server.url)
+
+        :param tokens: the SyntheticToken instances served. Defaults to one FAT-0 and one FAT-1 token.
+        :param latency: seconds added to every HTTP request, or a (min, max) tuple to draw it from
+        :param error_rate: the fraction of calls answered with a TokenSyncing error
+        :param host: the interface to listen on
+        :param port: the port to listen on; 0 picks a free port
+        :param seed: the seed of the random generator used for latency and errors
+        """
+
+        if tokens is None:
+            tokens = [SyntheticToken(), SyntheticToken(token_id="synthetic-nft", token_type="FAT-1", seed=1)]
+        self.tokens = {token.chain_id: token for token in tokens}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.sync_height = 200000
+        self.requests = 0
+        self.sent_transactions = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def handle(self, body):
+        """
+        Answer a decoded JSON-RPC request or batch.
+
+        :return: a tuple of the HTTP status code and the JSON response
+        """
+
+        with self._lock:
+            self.requests += 1
+            latency = self._rng.uniform(*self.latency) if isinstance(self.latency, tuple) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        if isinstance(body, list):
+            return 200, [self.handle_call(call) for call in body]
+
+        response = self.handle_call(body)
+        return (400 if "error" in response else 200), response
+
+    def handle_call(self, call):
+        request_id = call.get("id")
+        try:
+            with self._lock:
+                fail = self.error_rate and self._rng.random() < self.error_rate
+            if fail:
+                raise RPCError(TOKEN_SYNCING, "Token Syncing")
+            handler = getattr(self, "rpc_" + call.get("method", "").replace("-", "_"), None)
+            if handler is None:
+                raise RPCError(METHOD_NOT_FOUND, "Method not found")
+            result = handler(call.get("params") or {})
+        except RPCError as error:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": error.code, "message": error.message}}
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def token(self, params):
+        chain_id = params.get("chainid")
+        if chain_id is None:
+            for token in self.tokens.values():
+                if token.token_id == params.get("tokenid") and token.issuer_id == params.get("issuerid"):
+                    return token
+        elif chain_id in self.tokens:
+            return self.tokens[chain_id]
+        raise RPCError(TOKEN_NOT_FOUND, "Token Not Found")
+
+    @staticmethod
+    def param(params, name):
+        if name not in params:
+            raise RPCError(INVALID_PARAMS, "Invalid params: missing {}".format(name))
+        return params[name]
+
+    def rpc_get_issuance(self, params):
+        token = self.token(params)
+        return {
+            "chainid": token.chain_id,
+            "tokenid": token.token_id,
+            "issuerid": token.issuer_id,
+            "entryhash": sha256(token.chain_id.encode()).hexdigest(),
+            "timestamp": token.issuance_timestamp,
+            "issuance": token.issuance,
+        }
+
+    def rpc_get_transaction(self, params):
+        token = self.token(params)
+        i = token.by_entry_hash.get(self.param(params, "entryhash"))
+        if i is None:
+            raise RPCError(TRANSACTION_NOT_FOUND, "Transaction Not Found")
+        return token.transactions[i]
+
+    def rpc_get_transactions(self, params):
+        token = self.token(params)
+        transactions = token.transactions
+        if "entryhash" in params:
+            start = token.by_entry_hash.get(params["entryhash"])
+            if start is None:
+                raise RPCError(TRANSACTION_NOT_FOUND, "Transaction Not Found")
+            transactions = transactions[start:]
+        if params.get("order", "asc") == "desc":
+            transactions = transactions[::-1]
+
+        addresses = set(params.get("addresses") or ())
+        to_from = params.get("tofrom")
+        nf_token_id = params.get("nftokenid")
+        if addresses or nf_token_id is not None:
+            transactions = [tx for tx in transactions if self._matches(tx, addresses, to_from, nf_token_id)]
+
+        page = params.get("page", 1)
+        limit = params.get("limit", 25)
+        transactions = transactions[(page - 1) * limit:page * limit]
+        if not transactions:
+            raise RPCError(TRANSACTION_NOT_FOUND, "Transaction Not Found")
+        return transactions
+
+    @staticmethod
+    def _matches(tx, addresses, to_from, nf_token_id):
+        data = tx["data"]
+        if nf_token_id is not None and not any(nf_token_id in ids for ids in data["inputs"].values()):
+            return False
+        if addresses:
+            inputs = to_from != "to" and addresses.intersection(data["inputs"])
+            outputs = to_from != "from" and addresses.intersection(data["outputs"])
+            return bool(inputs or outputs)
+        return True
+
+    def rpc_get_balance(self, params):
+        return self.token(params).balance(self.param(params, "address"))
+
+    def rpc_get_balances(self, params):
+        address = self.param(params, "address")
+        return {
+            chain_id: token.balance(address) for chain_id, token in self.tokens.items() if token.balance(address)
+        }
+
+    def rpc_get_nf_balance(self, params):
+        token = self.token(params)
+        return sorted(token.balances.get(self.param(params, "address"), []))
+
+    def rpc_get_stats(self, params):
+        return self.token(params).stats()
+
+    def rpc_get_nf_token(self, params):
+        token = self.token(params)
+        nf_token = token.nf_tokens.get(self.param(params, "nftokenid"))
+        if nf_token is None:
+            raise RPCError(TOKEN_NOT_FOUND, "Token Not Found")
+        return nf_token
+
+    def rpc_get_nf_tokens(self, params):
+        nf_tokens = sorted(self.token(params).nf_tokens.values(), key=lambda t: t["id"])
+        if params.get("order", "asc") == "desc":
+            nf_tokens = nf_tokens[::-1]
+        page = params.get("page", 1)
+        limit = params.get("limit", 25)
+        return nf_tokens[(page - 1) * limit:page * limit]
+
+    def rpc_send_transaction(self, params):
+        token = self.token(params)
+        ext_ids = [bytes.fromhex(x) for x in self.param(params, "extids")]
+        content = bytes.fromhex(self.param(params, "content"))
+        entry_hash = Entry(bytes.fromhex(token.chain_id), ext_ids, content).entry_hash.hex()
+        with self._lock:
+            self.sent_transactions.append({"chainid": token.chain_id, "extids": ext_ids, "content": content})
+        return {"chainid": token.chain_id, "txid": sha256(content).hexdigest(), "entryhash": entry_hash}
+
+    def rpc_get_daemon_tokens(self, params):
+        return [
+            {"chainid": token.chain_id, "tokenid": token.token_id, "issuerid": token.issuer_id}
+            for token in self.tokens.values()
+        ]
+
+    def rpc_get_daemon_properties(self, params):
+        return {"fatdversion": "mock", "apiversion": "1"}
+
+    def rpc_get_sync_status(self, params):
+        return {"syncheight": self.sync_height, "factomheight": self.sync_height}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            error = {"code": -32700, "message": "Parse error"}
+            status, response = 400, {"jsonrpc": "2.0", "id": None, "error": error}
+        else:
+            status, response = self.server.mock.handle(body)
+
+        payload = json.dumps(response, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+__all__ = ["COINBASE_ADDRESS", "SyntheticToken", "MockFATd"]
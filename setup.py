@@ -18,5 +18,6 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    install_requires=["factom-keys", "factom-core", "urllib3", "requests"]
+    install_requires=["factom-keys", "factom-core", "urllib3", "requests"],
+    extras_require={"async": ["aiohttp"], "numpy": ["numpy"]},
 )
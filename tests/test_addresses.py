@@ -0,0 +1,28 @@
+from factom_keys.fct import FactoidAddress
+from pytest import raises
+from fat.addresses import canonical_address, validate_addresses
+from fat.errors import InvalidAddresses, InvalidParam
+
+
+class TestAddresses:
+    address1 = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+    address2 = "FA3j68XNwKwvHXV2TKndxPpyCK3KrWTDyyfxzi8LwuM5XRuEmhy6"
+
+    def test_canonical_address(self):
+        assert canonical_address(self.address1) == self.address1
+        assert canonical_address(FactoidAddress(address_string=self.address2)) == self.address2
+        with raises(ValueError):
+            canonical_address(self.address1[:-1] + "X")
+        with raises(InvalidParam):
+            canonical_address(42)
+
+    def test_validate_addresses_reports_all(self):
+        assert validate_addresses([self.address1, FactoidAddress(address_string=self.address2)]) == [
+            self.address1,
+            self.address2,
+        ]
+
+        bad = [self.address1[:-1] + "X", "FA", 42]
+        with raises(InvalidAddresses) as error:
+            validate_addresses([self.address1] + bad + [self.address2])
+        assert error.value.addresses == bad
@@ -0,0 +1,117 @@
+import asyncio
+from pytest import importorskip, raises
+from fat import AsyncFATd
+from fat.errors import TransactionNotFound
+from fat.fat0 import Transaction
+from factom_keys.fct import FactoidPrivateKey
+from fat.metrics import Metrics
+
+web = importorskip("aiohttp.web")
+
+
+def respond(call):
+    if call["method"] == "get-transactions":
+        params = call["params"]
+        start = (params["page"] - 1) * params["limit"]
+        return {"jsonrpc": "2.0", "id": call["id"], "result": list(range(7))[start:start + params["limit"]]}
+    if call["method"] == "send-transaction":
+        return {"jsonrpc": "2.0", "id": call["id"], "result": {"entryhash": call["params"]["content"][:64]}}
+    if call["method"] == "get-transaction":
+        return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32803, "message": "not found"}}
+    return {"jsonrpc": "2.0", "id": call["id"], "result": call.get("params")}
+
+
+async def handle(request):
+    body = await request.json()
+    if isinstance(body, list):
+        return web.json_response([respond(call) for call in reversed(body)])
+    response = respond(body)
+    return web.json_response(response, status=400 if "error" in response else 200)
+
+
+def run_with_node(test, **kwargs):
+    async def main():
+        app = web.Application()
+        app.router.add_post("/v1", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with AsyncFATd(host="http://127.0.0.1:{}".format(port), max_concurrency=4, **kwargs) as fatd:
+                await test(fatd)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+class TestAsyncFATd:
+    address = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+
+    def test_concurrent_requests(self):
+        async def test(fatd):
+            responses = await asyncio.gather(*[fatd.get_balance(self.address, chain_id=str(i)) for i in range(50)])
+            assert [r["result"]["chainid"] for r in responses] == [str(i) for i in range(50)]
+
+        run_with_node(test)
+
+    def test_error_response(self):
+        async def test(fatd):
+            with raises(TransactionNotFound):
+                await fatd.get_transaction("cd", chain_id="ab")
+
+        run_with_node(test)
+
+    def test_batch(self):
+        async def test(fatd):
+            async with fatd.batch(batch_size=2) as batch:
+                balances = [batch.get_balance(self.address, chain_id=str(i)) for i in range(5)]
+            assert [b.result["chainid"] for b in balances] == [str(i) for i in range(5)]
+
+        run_with_node(test)
+
+    def test_iter_transactions(self):
+        async def test(fatd):
+            items = [tx async for tx in fatd.iter_transactions(chain_id="ab", limit=3)]
+            assert items == list(range(7))
+
+        run_with_node(test)
+
+    def test_get_all_transactions_parallel(self):
+        async def test(fatd):
+            assert await fatd.get_all_transactions(chain_id="ab", limit=2, workers=3) == list(range(7))
+
+        run_with_node(test)
+
+    def test_metrics(self):
+        metrics = Metrics()
+
+        async def test(fatd):
+            await fatd.get_balance(self.address, chain_id="ab")
+            with raises(TransactionNotFound):
+                await fatd.get_transaction("cd", chain_id="ab")
+
+        run_with_node(test, observers=[metrics])
+        stats = metrics.snapshot()
+        assert stats["get-balance"]["count"] == 1
+        assert stats["get-balance"]["request_bytes"] > 0
+        assert stats["get-balance"]["response_bytes"] > 0
+        assert stats["get-transaction"]["errors"] == {"TransactionNotFound": 1}
+
+    def test_submit_many(self):
+        key = FactoidPrivateKey(key_string="Fs1fR4dMNdyp1a6qYfkLFPJZUyRg1uFW3b6NEK9VaRELD4qALstq")
+        address = key.get_factoid_address().to_string()
+        transactions = [
+            Transaction(inputs={address: i + 1}, outputs={self.address: i + 1}, chain_id="ab" * 32, signers=[key])
+            for i in range(20)
+        ]
+
+        async def test(fatd):
+            results = [result async for result in fatd.submit_many(transactions, window=4)]
+            assert sorted(result.index for result in results) == list(range(20))
+            assert all(result.ok for result in results)
+            assert all(result.entry_hash == result.tx._content.hex()[:64] for result in results)
+
+        run_with_node(test)
@@ -0,0 +1,73 @@
+from fat.cache import cache_key, DiskCache, LRUCache, SyncHeightCache
+
+
+class TestCache:
+    def test_cache_key_normalizes_params(self):
+        assert cache_key("get-balance", {"chainid": "ab", "address": "FA"}) == cache_key(
+            "get-balance", {"address": "FA", "chainid": "ab"}
+        )
+        assert cache_key("get-balance", {"chainid": "ab"}) != cache_key("get-stats", {"chainid": "ab"})
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_disk_cache_persists(self, tmp_path):
+        path = str(tmp_path / "responses.db")
+        cache = DiskCache(path)
+        cache.set("a", {"result": [1, 2]})
+        cache.close()
+
+        cache = DiskCache(path)
+        assert cache.get("a") == {"result": [1, 2]}
+        assert cache.get("b") is None
+        assert len(cache) == 1
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_sync_height_cache(self):
+        cache = SyncHeightCache(interval=60)
+        assert cache.claim_check()
+        assert not cache.claim_check()
+
+        # Nothing is cached until the height is known.
+        cache.set(cache.key("get-stats"), 1)
+        assert cache.get(cache.key("get-stats")) is None
+
+        cache.update_height(10)
+        key = cache.key("get-stats")
+        cache.set(key, 1)
+        assert cache.get(key) == 1
+        cache.update_height(10)
+        assert cache.get(key) == 1
+
+        cache.update_height(11)
+        assert cache.get(key) is None
+        assert cache.get(cache.key("get-stats")) is None
+
+    def test_sync_height_cache_failed_check(self):
+        cache = SyncHeightCache(interval=60)
+        assert cache.claim_check()
+        cache.update_height(10)
+        key = cache.key("get-stats")
+        cache.set(key, 1)
+
+        # A failed check stops serving entries and lets the next request check again.
+        cache._checked_at = None
+        assert cache.claim_check()
+        cache.check_failed()
+        assert cache.get(key) is None
+        cache.set(cache.key("get-stats"), 2)
+        assert cache.get(cache.key("get-stats")) is None
+        assert cache.claim_check()
+        assert not cache.claim_check()
+
+        cache.update_height(10)
+        assert not cache.claim_check()
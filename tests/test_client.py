@@ -1,9 +1,332 @@
-from pytest import fixture
+import json
+import threading
+import time
+from factom_keys.fct import FactoidPrivateKey
+from pytest import fixture, raises
 from fat import FATd
+from fat.cache import SyncHeightCache
+from fat.errors import DuplicateTransaction, InvalidParam, InvalidTransaction, TokenSyncing, TransactionNotFound
+from fat.fat0 import Transaction
+from fat.session import RetryPolicy
+from fat.testing import MockFATd, SyntheticToken
+
+
+class BatchResponse:
+    def __init__(self, body):
+        self.status_code = 200
+        self.content = json.dumps(body).encode()
+
+
+class BatchSession:
+    """Answers JSON-RPC batches in reverse order, echoing each call's params as its result."""
+
+    def __init__(self):
+        self.posts = []
+
+    def request(self, method, url, data=None, timeout=None):
+        data = json.loads(data)
+        self.posts.append(data)
+        if isinstance(data, dict):
+            return BatchResponse(self.respond(data))
+        return BatchResponse([self.respond(call) for call in reversed(data)])
+
+    @staticmethod
+    def respond(call):
+        if call["method"] == "get-transaction":
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32803, "message": "not found"}}
+        return {"jsonrpc": "2.0", "id": call["id"], "result": call.get("params")}
+
+
+class SyncingSession(BatchSession):
+    """A BatchSession for a node whose sync height can be moved by the test."""
+
+    height = 100
+
+    def respond(self, call):
+        if call["method"] == "get-sync-status":
+            return {"jsonrpc": "2.0", "id": call["id"], "result": {"syncheight": self.height, "factomheight": 100}}
+        return BatchSession.respond(call)
+
+
+class SyncFailingSession(SyncingSession):
+    """A SyncingSession whose sync status requests fail with a 500 while failing is set."""
+
+    failing = True
+
+    def request(self, method, url, data=None, timeout=None):
+        call = json.loads(data)
+        if self.failing and isinstance(call, dict) and call["method"] == "get-sync-status":
+            self.posts.append(call)
+            response = BatchResponse({"jsonrpc": "2.0", "id": 0, "error": {"code": -32603, "message": "internal"}})
+            response.status_code = 500
+            return response
+        return SyncingSession.request(self, method, url, data, timeout)
+
+
+class FlakySession(BatchSession):
+    """A BatchSession for a node that answers the first requests with a TokenSyncing error."""
+
+    def __init__(self, failures):
+        BatchSession.__init__(self)
+        self.failures = failures
+
+    def request(self, method, url, data=None):
+        if self.failures:
+            self.failures -= 1
+            self.posts.append(json.loads(data))
+            response = BatchResponse({"jsonrpc": "2.0", "id": 0, "error": {"code": -32805, "message": "syncing"}})
+            response.status_code = 400
+            return response
+        return BatchSession.request(self, method, url, data)
+
+
+class SlowSession(BatchSession):
+    def request(self, method, url, data=None):
+        time.sleep(0.1)
+        return BatchSession.request(self, method, url, data)
+
+
+class PagedSession:
+    """Serves get-transactions pages out of a list, erroring past the end like fatd does."""
+
+    def __init__(self, items):
+        self.items = items
+        self.pages = []
+
+    def request(self, method, url, data=None):
+        params = json.loads(data)["params"]
+        self.pages.append(params["page"])
+        start = (params["page"] - 1) * params["limit"]
+        page = self.items[start:start + params["limit"]]
+        if not page:
+            response = BatchResponse({"jsonrpc": "2.0", "id": 0, "error": {"code": -32803, "message": "not found"}})
+            response.status_code = 400
+            return response
+        return BatchResponse({"jsonrpc": "2.0", "id": 0, "result": page})
 
 
 class TestBaseAPI:
-    pass
+    @fixture
+    def fatd(self):
+        fatd = FATd()
+        fatd.session = BatchSession()
+        return fatd
+
+    def test_call_many_chunks_and_orders(self, fatd):
+        calls = [("get-balance", {"chainid": "ab", "address": str(i)}) for i in range(5)]
+        responses = fatd.call_many(calls, batch_size=2)
+        assert len(fatd.session.posts) == 3
+        assert [r["result"]["address"] for r in responses] == ["0", "1", "2", "3", "4"]
+
+    def test_batch_context(self, fatd):
+        with fatd.batch() as batch:
+            balance = batch.get_balance("FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW", chain_id="ab")
+            missing = batch.get_transaction("cd", chain_id="ab")
+        assert len(fatd.session.posts) == 1
+        assert balance.result["address"] == "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+        with raises(TransactionNotFound):
+            missing.result
+
+    def test_batch_only_queues_calls(self, fatd):
+        with fatd.batch() as batch:
+            stats = batch.call("get-stats", {"chainid": "ab"})
+            with raises(InvalidParam):
+                batch.call("get-stats", {"chainid": "ab"}, raw=True)
+            for method in ("iter_transactions", "get_all_transactions", "submit_many", "batch", "call_many"):
+                assert not hasattr(batch, method)
+        assert stats.result == {"chainid": "ab"}
+        assert len(batch.calls) == 1
+
+    def test_immutable_responses_cached(self, fatd):
+        first = fatd.get_issuance(chain_id="ab")
+        assert fatd.get_issuance(chain_id="ab") is first
+        fatd.get_balance("FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW", chain_id="ab")
+        fatd.get_balance("FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW", chain_id="ab")
+        assert len(fatd.session.posts) == 3
+
+        # Cached calls are left out of batches.
+        fatd.call_many([("get-issuance", {"chainid": "ab"}), ("get-stats", {"chainid": "ab"})])
+        assert fatd.session.posts[-1] == [{"jsonrpc": "2.0", "id": 0, "method": "get-stats",
+                                           "params": {"chainid": "ab"}}]
+
+    def test_raw_call(self, fatd):
+        raw = fatd.call("get-stats", {"chainid": "ab"}, raw=True)
+        assert json.loads(raw) == {"jsonrpc": "2.0", "id": 0, "result": {"chainid": "ab"}}
+
+        # Raw responses of cached methods are still cached.
+        raw = fatd.call("get-issuance", {"chainid": "ab"}, raw=True)
+        assert json.loads(fatd.call("get-issuance", {"chainid": "ab"}, raw=True)) == json.loads(raw)
+        assert fatd.get_issuance(chain_id="ab")["result"] == {"chainid": "ab"}
+        assert len(fatd.session.posts) == 2
+
+    def test_cache_opt_in(self):
+        fatd = FATd(cache_methods=["get-stats"])
+        fatd.session = BatchSession()
+        fatd.get_stats(chain_id="ab")
+        fatd.get_stats(chain_id="ab")
+        assert len(fatd.session.posts) == 1
+
+        fatd = FATd(cache=False)
+        fatd.session = BatchSession()
+        fatd.get_issuance(chain_id="ab")
+        fatd.get_issuance(chain_id="ab")
+        assert len(fatd.session.posts) == 2
+
+    def test_sync_height_cache(self):
+        fatd = FATd(sync_cache=SyncHeightCache(interval=0))
+        fatd.session = SyncingSession()
+        address = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+
+        first = fatd.get_balance(address, chain_id="ab")
+        assert fatd.get_balance(address, chain_id="ab") is first
+        methods = [post["method"] for post in fatd.session.posts]
+        assert methods == ["get-sync-status", "get-balance", "get-sync-status"]
+
+        fatd.session.height = 101
+        assert fatd.get_balance(address, chain_id="ab") is not first
+        assert fatd.session.posts[-1]["method"] == "get-balance"
+
+    def test_sync_height_cache_failed_poll(self):
+        fatd = FATd(sync_cache=SyncHeightCache(interval=60))
+        fatd.session = SyncFailingSession()
+        address = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+
+        # The read still succeeds, uncached, and the next read polls the sync height again.
+        assert fatd.get_balance(address, chain_id="ab")["result"] == {"address": address, "chainid": "ab"}
+        fatd.get_balance(address, chain_id="ab")
+        methods = [post["method"] for post in fatd.session.posts]
+        assert methods == ["get-sync-status", "get-balance"] * 2
+
+        fatd.session.failing = False
+        first = fatd.get_balance(address, chain_id="ab")
+        assert fatd.get_balance(address, chain_id="ab") is first
+        assert [post["method"] for post in fatd.session.posts[4:]] == ["get-sync-status", "get-balance"]
+
+    def test_retry_policy(self):
+        fatd = FATd(retry_policy=RetryPolicy(max_retries=2, backoff=0))
+        fatd.session = FlakySession(failures=2)
+        assert fatd.get_stats(chain_id="ab")["result"] == {"chainid": "ab"}
+        assert len(fatd.session.posts) == 3
+
+        fatd.session = FlakySession(failures=3)
+        with raises(TokenSyncing):
+            fatd.get_stats(chain_id="ab")
+        assert len(fatd.session.posts) == 3
+
+        # Sending a transaction is never retried.
+        fatd.session = FlakySession(failures=1)
+        with raises(TokenSyncing):
+            fatd.send_transaction([], "", chain_id="ab")
+        assert len(fatd.session.posts) == 1
+
+    def test_concurrent_requests_coalesced(self, fatd):
+        fatd.session = SlowSession()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fatd.get_stats(chain_id="ab"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(fatd.session.posts) == 1
+        assert fatd.coalesced == 4
+        assert all(result is results[0] for result in results)
+
+    def test_iter_transactions(self, fatd):
+        fatd.session = PagedSession(list(range(7)))
+        assert list(fatd.iter_transactions(chain_id="ab", limit=3)) == list(range(7))
+        assert fatd.session.pages == [1, 2, 3]
+
+        fatd.session = PagedSession(list(range(6)))
+        assert list(fatd.iter_transactions(chain_id="ab", limit=3)) == list(range(6))
+        assert fatd.session.pages == [1, 2, 3]
+
+    def test_get_all_transactions_parallel(self, fatd):
+        fatd.session = PagedSession(list(range(95)))
+        assert fatd.get_all_transactions(chain_id="ab", limit=10, workers=4) == list(range(95))
+        assert set(range(1, 11)).issubset(fatd.session.pages)
+
+
+class TestSubmitMany:
+    address1 = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+    address2 = "FA3j68XNwKwvHXV2TKndxPpyCK3KrWTDyyfxzi8LwuM5XRuEmhy6"
+    # A throwaway private key for address1.
+    private_key1 = FactoidPrivateKey(key_string="Fs1fR4dMNdyp1a6qYfkLFPJZUyRg1uFW3b6NEK9VaRELD4qALstq")
+
+    @fixture
+    def token(self):
+        return SyntheticToken(num_addresses=2, num_transactions=1)
+
+    def transactions(self, token, count):
+        for i in range(count):
+            tx = Transaction(inputs={self.address1: i + 1}, outputs={self.address2: i + 1}, chain_id=token.chain_id)
+            tx.add_signer(self.private_key1)
+            yield tx
+
+    def test_submit_many(self, token):
+        with MockFATd([token], latency=0.02) as server:
+            fatd = FATd(host=server.url)
+            started = time.perf_counter()
+            results = list(fatd.submit_many(self.transactions(token, 40), window=8))
+            elapsed = time.perf_counter() - started
+
+            assert sorted(result.index for result in results) == list(range(40))
+            assert all(result.ok and result.entry_hash == result.tx.entry_hash() for result in results)
+            assert len(server.sent_transactions) == 40
+            # Forty 20 ms round trips take 0.8 s one at a time.
+            assert elapsed < 0.5
+
+    def test_submit_many_reports_errors(self, token):
+        transactions = list(self.transactions(token, 3))
+        # Missing its signer, so signing fails before anything is sent.
+        unsigned = Transaction(inputs={self.address1: 1}, outputs={self.address2: 1}, chain_id=token.chain_id)
+        transactions.append(unsigned)
+        with MockFATd([token]) as server:
+            results = sorted(FATd(host=server.url).submit_many(transactions), key=lambda result: result.index)
+            assert [result.ok for result in results] == [True, True, True, False]
+            assert isinstance(results[3].error, InvalidTransaction)
+            assert len(server.sent_transactions) == 3
+
+        with MockFATd([token], error_rate=1.0) as server:
+            results = list(FATd(host=server.url).submit_many(self.transactions(token, 10), window=8))
+            assert all(isinstance(result.error, TokenSyncing) for result in results)
+            # Failed submissions still carry the locally computed entry hash.
+            assert all(result.entry_hash == result.tx.entry_hash() for result in results)
+            # Back-pressure keeps the window small while the node is failing.
+            assert server.requests == 10
+
+    def test_submit_many_resigns_changed_transactions(self, token):
+        tx = next(self.transactions(token, 1))
+        tx.sign()
+        stale = tx.entry_hash()
+        tx.add_output(self.address1, 0)
+        tx.add_input(self.address1, 1)
+        with MockFATd([token]) as server:
+            [result] = FATd(host=server.url).submit_many([tx])
+            assert result.ok and result.entry_hash == tx.entry_hash() != stale
+            assert server.sent_transactions[0]["content"] == tx.build_content()
+
+    def test_submit_many_skips_duplicates(self, token):
+        transactions = list(self.transactions(token, 3))
+        # The same inputs, outputs and signers in the same second make the same entry.
+        duplicate = Transaction(inputs={self.address1: 1}, outputs={self.address2: 1}, chain_id=token.chain_id)
+        duplicate._timestamp = transactions[0]._timestamp
+        transactions.append(duplicate.add_signer(self.private_key1))
+
+        submitted = set()
+        with MockFATd([token]) as server:
+            results = sorted(FATd(host=server.url).submit_many(transactions, window=1, submitted=submitted),
+                             key=lambda result: result.index)
+            assert [result.ok for result in results] == [True, True, True, False]
+            assert isinstance(results[3].error, DuplicateTransaction)
+            assert results[3].entry_hash == results[0].entry_hash
+            assert submitted == {result.entry_hash for result in results}
+            assert len(server.sent_transactions) == 3
+
+            # Running again with the same set sends nothing.
+            results = list(FATd(host=server.url).submit_many(transactions, submitted=submitted))
+            assert all(isinstance(result.error, DuplicateTransaction) for result in results)
+            assert len(server.sent_transactions) == 3
 
 
 class TestFATd:
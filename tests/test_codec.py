@@ -0,0 +1,18 @@
+from pytest import raises
+from fat.codec import get_codec, JSONCodec
+
+
+class TestCodec:
+    def test_json_codec_round_trip(self):
+        codec = JSONCodec()
+        data = {"jsonrpc": "2.0", "id": 0, "method": "get-balance", "params": {"address": "FA2g"}}
+        encoded = codec.dumps(data)
+        assert isinstance(encoded, bytes)
+        assert b" " not in encoded
+        assert codec.loads(encoded) == data
+
+    def test_get_codec(self):
+        assert get_codec("json").name == "json"
+        assert get_codec().name in ("json", "orjson", "ujson")
+        with raises(KeyError):
+            get_codec("yaml")
@@ -0,0 +1,36 @@
+import json
+import random
+from fat.encoding import encode_content
+
+
+def dumps(inputs, outputs, metadata=None):
+    content = {"inputs": inputs, "outputs": outputs}
+    if metadata:
+        content["metadata"] = metadata
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+class TestEncodeContent:
+    address1 = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+    address2 = "FA3j68XNwKwvHXV2TKndxPpyCK3KrWTDyyfxzi8LwuM5XRuEmhy6"
+
+    def test_matches_json_dumps(self):
+        cases = [
+            ({self.address1: 150}, {self.address2: 100, self.address1: 50}, None),
+            ({self.address1: 0}, {}, {}),
+            ({self.address1: [10]}, {self.address2: [1, 2, {"min": 4, "max": 100}]}, None),
+            ({self.address1: 2 ** 63}, {self.address2: 2 ** 63}, {"note": "Goodbye and thanks for all the fish!"}),
+            ({self.address1: True}, {self.address2: 1.5}, {"ünïcode": ["☃", None, 1e100]}),
+            ({'quo"te': 1}, {"spa ce": [{"max": 2, "min": 1}]}, "metadata"),
+            ({self.address1: [True, {"min": 1, "max": 2, "x": 3}]}, {self.address2: [1, 2]}, [1, 2]),
+            ({self.address1: 1}, {self.address2: [1]}, None),
+        ]
+        for inputs, outputs, metadata in cases:
+            assert encode_content(inputs, outputs, metadata) == dumps(inputs, outputs, metadata)
+
+    def test_random_contents(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            outputs = {"FA{}".format(i): rng.randint(0, 10 ** 12) for i in range(rng.randint(0, 30))}
+            inputs = {self.address1: sum(outputs.values())}
+            assert encode_content(inputs, outputs) == dumps(inputs, outputs)
@@ -0,0 +1,75 @@
+import math
+import random
+from factom_core.block_elements import Entry
+from factom_keys.fct import FactoidAddress, FactoidPrivateKey
+from pytest import raises
+from fat.errors import InvalidAddresses, InvalidParam
+from fat.fat0.airdrop import plan_airdrop
+
+
+class TestPlanAirdrop:
+    def setup(self):
+        # A throwaway private key.
+        self.key = FactoidPrivateKey(key_string="Fs1fR4dMNdyp1a6qYfkLFPJZUyRg1uFW3b6NEK9VaRELD4qALstq")
+        self.source = self.key.get_factoid_address().to_string()
+        self.chain_id = "145d5207a1ca2978e2a1cb43c97d538cd516d65cd5d14579549664bfecd80296"
+        rng = random.Random(0)
+        self.payouts = {
+            FactoidAddress(rcd_hash=bytes(rng.getrandbits(8) for _ in range(32))).to_string():
+                rng.randint(1, 10 ** 9)
+            for _ in range(1000)
+        }
+
+    def entry_size(self, tx):
+        # Factom counts everything after the 35 byte header of version, chain ID and ext_ids length.
+        tx.sign()
+        return len(Entry(bytes.fromhex(tx.chain_id), tx._ext_ids, tx._content).marshal()) - 35
+
+    def test_packs_outputs(self):
+        for max_kb, metadata in ((10, None), (3, {"note": "airdrop"})):
+            transactions = plan_airdrop(self.payouts, self.source, self.chain_id, self.key, metadata, max_kb)
+
+            paid = {}
+            for tx in transactions:
+                paid.update(tx.outputs)
+                assert tx.inputs == {self.source: sum(tx.outputs.values())}
+            assert paid == self.payouts
+
+            for tx, next_tx in zip(transactions, transactions[1:]):
+                assert self.entry_size(tx) <= max_kb * 1024
+                assert math.ceil(self.entry_size(tx) / 1024) == max_kb
+
+                # The first output of the next transaction wouldn't have fit.
+                address, amount = next(iter(next_tx.outputs.items()))
+                tx.add_output(address, amount)
+                tx.add_input(self.source, sum(tx.outputs.values()))
+                assert self.entry_size(tx) > max_kb * 1024
+            assert self.entry_size(transactions[-1]) <= max_kb * 1024
+
+    def test_entries_fit(self):
+        # Amounts of every length leave some entries within a few bytes of 10 KB.
+        for seed in range(5):
+            rng = random.Random(seed)
+            payouts = {
+                FactoidAddress(rcd_hash=bytes(rng.getrandbits(8) for _ in range(32))).to_string():
+                    rng.randint(1, 10 ** rng.randint(1, 18))
+                for _ in range(600)
+            }
+            for tx in plan_airdrop(payouts, self.source, self.chain_id, self.key):
+                assert tx.size() == self.entry_size(tx) <= 10240
+
+    def test_invalid_payouts(self):
+        with raises(InvalidParam):
+            plan_airdrop({self.source: 1}, self.source)
+        with raises(InvalidParam):
+            plan_airdrop({next(iter(self.payouts)): 0}, self.source)
+        with raises(InvalidParam):
+            plan_airdrop(self.payouts, self.source, max_kb=11)
+
+    def test_reports_invalid_addresses(self):
+        payouts = dict(self.payouts)
+        payouts["FA123"] = 5
+        payouts["FA456"] = 6
+        with raises(InvalidAddresses) as error:
+            plan_airdrop(payouts, self.source)
+        assert error.value.addresses == ["FA123", "FA456"]
@@ -0,0 +1,97 @@
+import tracemalloc
+from factom_keys.fct import FactoidAddress, FactoidPrivateKey
+from pytest import raises
+from fat import addresses
+from fat.errors import InvalidParam
+from fat.fat0 import Transaction
+from fat.fat0.compact import CompactTransaction
+
+
+class TestCompactTransaction:
+    def setup(self):
+        # These are throwaway private keys.
+        self.chain_id = "145d5207a1ca2978e2a1cb43c97d538cd516d65cd5d14579549664bfecd80296"
+        self.key1 = FactoidPrivateKey(key_string="Fs1fR4dMNdyp1a6qYfkLFPJZUyRg1uFW3b6NEK9VaRELD4qALstq")
+        self.key2 = FactoidPrivateKey(key_string="Fs2jSmXgaysrqiADPmAvvb71NfAa9MqvXvRemozTE8LRc64hLqtf")
+        self.address1 = self.key1.get_factoid_address().to_string()
+        self.address2 = self.key2.get_factoid_address().to_string()
+        self.address3 = "FA3rsxWx4WSN5Egj2ZxPoju1mzwfjBivTDMcEvoC1JSsqkddZPCB"
+
+    def build(self, cls):
+        tx = cls(chain_id=self.chain_id, metadata={"note": "payout"})
+        tx.add_output(self.address3, 60)
+        tx.add_input(self.address1, 50)
+        tx.add_output(FactoidAddress(address_string=self.address2), 40)
+        tx.add_input(self.address2, 50)
+        tx.add_signer(self.key1)
+        tx.add_signer(self.key2)
+        tx._timestamp = "1571166720"
+        return tx
+
+    def test_matches_transaction(self):
+        tx, compact = self.build(Transaction), self.build(CompactTransaction)
+        assert compact.inputs == tx.inputs
+        assert compact.outputs == tx.outputs
+        assert compact.chain_id == tx.chain_id
+        assert compact.build_content() == tx.build_content()
+        assert compact.size() == tx.size() and compact.ec_cost() == tx.ec_cost()
+        assert compact.is_valid() and not compact.is_mint()
+
+        tx.sign()
+        compact.sign()
+        assert compact._ext_ids == tx._ext_ids
+        assert compact._content == tx._content
+
+        compact.add_output(self.address1, 0)
+        assert compact._ext_ids is None
+        compact.sign()
+        assert compact._content == compact.build_content()
+
+    def test_repeated_addresses_merge(self):
+        tx, compact = Transaction(), CompactTransaction()
+        for t in (tx, compact):
+            t.add_input(self.address1, 10).add_output(self.address2, 3).add_output(self.address3, 4)
+            t.add_output(self.address2, 6)
+        assert compact.build_content() == tx.build_content()
+        assert compact.outputs == {self.address2: 6, self.address3: 4}
+
+    def test_validation(self):
+        tx = CompactTransaction()
+        with raises(InvalidParam):
+            tx.add_output(self.address1, -1)
+        with raises(InvalidParam):
+            tx.add_output(self.address1, 2 ** 64)
+        with raises(ValueError):
+            tx.add_output("FA3", 1)
+
+        tx.add_input(self.address1, 5).add_output(self.address2, 5).add_signer(self.key1)
+        assert not tx.is_valid()
+        tx.set_chain_id(self.chain_id)
+        assert tx.is_valid()
+        tx.add_output(self.address3, 1)
+        assert not tx.is_valid()
+
+    def test_memory(self):
+        def measure(cls):
+            tracemalloc.start()
+            transactions = []
+            for i in range(500):
+                tx = cls(chain_id=self.chain_id)
+                tx.add_input(self.address1, 10 * (i + 1))
+                for j in range(10):
+                    # Each recipient address string is only referenced by the transaction.
+                    address = FactoidAddress(rcd_hash=(i * 10 + j).to_bytes(32, "big")).to_string()
+                    tx.add_output(address, i + 1)
+                tx.add_signer(self.key1)
+                # Budgeting a transaction doesn't keep its content.
+                tx.ec_cost()
+                transactions.append(tx)
+            # Leave out the bounded address caches shared by all transactions.
+            addresses._canonical_string.cache_clear()
+            addresses._rcd_hash_of_string.cache_clear()
+            addresses.address_from_rcd_hash.cache_clear()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size
+
+        assert measure(CompactTransaction) * 2 < measure(Transaction)
@@ -0,0 +1,76 @@
+from pytest import importorskip, raises
+from fat.errors import InvalidParam
+from fat.fat0 import Transaction
+from fat.testing import COINBASE_ADDRESS, SyntheticToken
+
+importorskip("numpy")
+
+from fat.fat0.replay import BalanceReplay  # noqa: E402
+
+
+class TestBalanceReplay:
+    def setup(self):
+        self.token = SyntheticToken(num_addresses=50, num_transactions=500, seed=5)
+
+    def expected_balances(self, timestamp=None):
+        balances = {}
+        for tx in self.token.transactions:
+            if timestamp is not None and tx["timestamp"] > timestamp:
+                break
+            for address, amount in tx["data"]["inputs"].items():
+                balances[address] = balances.get(address, 0) - amount
+            for address, amount in tx["data"]["outputs"].items():
+                balances[address] = balances.get(address, 0) + amount
+        balances.pop(COINBASE_ADDRESS, None)
+        return {address: balance for address, balance in balances.items() if balance}
+
+    def test_balances(self):
+        replay = BalanceReplay(self.token.transactions)
+        assert len(replay) == 1000
+        assert replay.balances() == self.expected_balances()
+        for address in self.token.addresses:
+            assert replay.balance(address) == self.token.balance(address)
+        assert replay.circulating() == self.token.minted
+
+    def test_balances_as_of(self):
+        replay = BalanceReplay(self.token.transactions)
+        for tx in self.token.transactions[::97]:
+            timestamp = tx["timestamp"]
+            expected = self.expected_balances(timestamp)
+            assert replay.balances(timestamp) == expected
+            address = next(iter(expected))
+            assert replay.balance(address, timestamp) == expected[address]
+        assert replay.balances(0) == {}
+
+    def test_balance_history(self):
+        replay = BalanceReplay(self.token.transactions)
+        address = self.token.addresses[0]
+        timestamps, balances = replay.balance_history(address)
+        assert balances[-1] == self.token.balance(address)
+        assert (balances >= 0).all()
+        assert replay.balance(address, int(timestamps[0])) == balances[0]
+
+    def test_incremental_and_unordered(self):
+        transactions = self.token.transactions
+        replay = BalanceReplay(transactions[250:])
+        replay.add(transactions[:250])
+        assert replay.balances() == self.expected_balances()
+        timestamp = transactions[99]["timestamp"]
+        assert replay.balances(timestamp) == self.expected_balances(timestamp)
+
+    def test_build_content(self):
+        a = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+        b = "FA3j68XNwKwvHXV2TKndxPpyCK3KrWTDyyfxzi8LwuM5XRuEmhy6"
+        tx = Transaction(inputs={a: 10}, outputs={b: 10})
+        replay = BalanceReplay([{"inputs": {COINBASE_ADDRESS: 25}, "outputs": {a: 25}}, tx.build_content()])
+        assert replay.balances() == {a: 15, b: 10}
+        assert replay.circulating() == 25
+
+    def test_amounts_must_fit_int64(self):
+        a = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+        replay = BalanceReplay([{"inputs": {COINBASE_ADDRESS: 2 ** 63 - 1}, "outputs": {a: 2 ** 63 - 1}}])
+        assert replay.balance(a) == 2 ** 63 - 1
+        with raises(InvalidParam):
+            replay.add([{"inputs": {COINBASE_ADDRESS: 2 ** 63}, "outputs": {a: 2 ** 63}}])
+        # Nothing of the rejected transaction was added.
+        assert len(replay) == 2
@@ -1,6 +1,8 @@
 import sys
 from base64 import b64decode
-from pytest import fixture
+from factom_core.block_elements import Entry
+from pytest import fixture, raises
+from fat.errors import InvalidTransaction
 from fat.fat0.transactions import Transaction
 from factom_keys.fct import FactoidPrivateKey, FactoidAddress
 sys.path.insert(0, '/home/samuel/Coding/factom-keys')
@@ -113,4 +115,56 @@ class TestTransaction:
         # Skip comparing timestamps
         assert tx2_extids == actual_tx2_extids
 
+    def test_content_is_cached(self, tx1):
+        content = tx1.build_content()
+        assert tx1.build_content() is content
 
+        tx1.add_output(self.address2, 0)
+        assert tx1.build_content() is not content
+        assert tx1.build_content() != content
+
+        content = tx1.build_content()
+        tx1.set_metadata({"note": "cached"})
+        assert b'"metadata":{"note":"cached"}' in tx1.build_content()
+
+        tx1.outputs = {self.address1.to_string(): 50}
+        assert tx1.build_content() == b'{"inputs":{"%s":50},"outputs":{"%s":50},"metadata":{"note":"cached"}}' % (
+            self.address3.to_string().encode(), self.address1.to_string().encode())
+
+    def test_size_and_ec_cost(self, tx2):
+        size = tx2.size()
+        tx2.sign()
+        # Factom counts everything after the 35 byte header of version, chain ID and ext_ids length.
+        entry = Entry(bytes.fromhex(tx2.chain_id), tx2._ext_ids, tx2._content)
+        assert size == len(entry.marshal()) - 35
+        assert tx2.ec_cost() == 1
+
+        tx2.set_metadata({"note": "x" * 1024})
+        assert tx2.size() == size + len(',"metadata":{"note":""}') + 1024
+        assert tx2.ec_cost() == 2
+
+    def test_entry_hash(self, tx2):
+        with raises(InvalidTransaction):
+            tx2.entry_hash()
+
+        # Override timestamp to match historical transactions
+        tx2._timestamp = "1571166720"
+        tx2.sign()
+        assert tx2.entry_hash() == "8279a10c9c26ce55ef29f382df4e8d4c31ce556f1c3efe4fbbd75ed396a56ef9"
+
+    def test_changes_drop_signature(self):
+        changes = [
+            lambda tx: tx.add_input(self.address3, 0),
+            lambda tx: tx.add_output(self.address1, 0),
+            lambda tx: tx.set_metadata({"note": "changed"}),
+            lambda tx: tx.add_signer(self._private_fct_key3),
+            lambda tx: tx.set_chain_id(self.chain_id),
+            lambda tx: setattr(tx, "outputs", {self.address3.to_string(): 150}),
+        ]
+        for change in changes:
+            tx = Transaction(inputs={self.address3: 150}, outputs={self.address1: 150}, chain_id=self.chain_id)
+            tx.add_signer(self._private_fct_key3).sign()
+            tx.entry_hash()
+            change(tx)
+            with raises(InvalidTransaction):
+                tx.entry_hash()
@@ -0,0 +1,65 @@
+import random
+from pytest import raises
+from fat.errors import InvalidParam
+from fat.fat1.rangeset import RangeSet
+
+
+class TestRangeSet:
+    def test_coalesces(self):
+        ids = RangeSet([5, 3, 4, {"min": 10, "max": 20}, 21, {"min": 15, "max": 16}])
+        assert list(ids.ranges()) == [(3, 5), (10, 21)]
+        assert len(ids) == 15
+        assert ids.range_count == 2
+        assert 4 in ids and 21 in ids
+        assert 6 not in ids and 0 not in ids and 22 not in ids
+
+    def test_from_json_rejects_invalid(self):
+        with raises(InvalidParam):
+            RangeSet.from_json([1, {"min": 0, "max": 2}])
+        for invalid in ([-1], [2 ** 64], [{"min": 1, "max": 2 ** 64}], [{"min": 3, "max": 2}], [{"min": 1}], ["1"],
+                        [True], 5):
+            with raises(InvalidParam):
+                RangeSet.from_json(invalid)
+
+    def test_to_json_is_compact(self):
+        assert RangeSet([10]).to_json() == [10]
+        assert RangeSet([1, 2, 3]).to_json() == [1, 2, 3]
+        assert RangeSet.from_range(0, 10000000).to_json() == [{"min": 0, "max": 10000000}]
+        assert RangeSet([1, 2, {"min": 4, "max": 100}]).to_json() == [1, 2, {"min": 4, "max": 100}]
+        assert RangeSet(RangeSet([7, 9]).to_json()) == RangeSet([7, 9])
+
+    def test_set_operations_match_python_sets(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            a = set(rng.sample(range(60), rng.randint(0, 40)))
+            b = set(rng.sample(range(60), rng.randint(0, 40)))
+            x, y = RangeSet(sorted(a)), RangeSet(sorted(b))
+            assert set(x | y) == a | b
+            assert set(x & y) == a & b
+            assert set(x - y) == a - b
+            assert set(y - x) == b - a
+            assert x.isdisjoint(y) == a.isdisjoint(b)
+
+    def test_large_ranges(self):
+        ids = RangeSet.from_range(0, 10 ** 12)
+        hole = RangeSet.from_range(10, 10 ** 11)
+        rest = ids - hole
+        assert list(rest.ranges()) == [(0, 9), (10 ** 11 + 1, 10 ** 12)]
+        assert rest | hole == ids
+        assert (rest & hole) == RangeSet()
+        assert len(ids) == 10 ** 12 + 1
+
+    def test_uint64_ids(self):
+        top = 2 ** 64 - 1
+        ids = RangeSet([2 ** 63, {"min": top - 5, "max": top}])
+        assert list(ids.ranges()) == [(2 ** 63, 2 ** 63), (top - 5, top)]
+        assert top in ids and 2 ** 64 not in ids
+        assert list((ids - RangeSet([top])).ranges()) == [(2 ** 63, 2 ** 63), (top - 5, top - 1)]
+        assert RangeSet.from_range(0, top) - ids | ids == RangeSet.from_range(0, top)
+        assert ids.to_json() == [2 ** 63, {"min": top - 5, "max": top}]
+
+    def test_disjoint_union(self):
+        ids = RangeSet.disjoint_union([RangeSet([1, 2]), RangeSet([{"min": 3, "max": 9}]), RangeSet([20])])
+        assert list(ids.ranges()) == [(1, 9), (20, 20)]
+        with raises(InvalidParam):
+            RangeSet.disjoint_union([RangeSet([1, 2]), RangeSet([{"min": 2, "max": 9}])])
@@ -1,6 +1,9 @@
+import json
 import sys
 from base64 import b64decode
-from pytest import fixture
+from pytest import fixture, raises
+from fat.errors import InvalidParam
+from fat.fat1.rangeset import RangeSet
 from fat.fat1.transactions import Transaction
 from factom_keys.fct import FactoidPrivateKey, FactoidAddress
 sys.path.insert(0, '/home/samuel/Coding/factom-keys')
@@ -111,4 +114,47 @@ class TestTransaction:
     #     actual_tx2_extids = tx2._ext_ids
 
     #     # Skip comparing timestamps
-    #     assert tx2_extids == actual_tx2_extids
\ No newline at end of file
+    #     assert tx2_extids == actual_tx2_extids
+    def test_ranges_are_compacted(self):
+        tx = Transaction()
+        tx.add_input(self.address1, [3, 1, 2, {"min": 10, "max": 1000}])
+        tx.add_output(self.address2, RangeSet.from_range(1, 3) | RangeSet.from_range(10, 1000))
+        content = json.loads(tx.build_content())
+        assert content["inputs"] == {self.address1.to_string(): [1, 2, 3, {"min": 10, "max": 1000}]}
+        assert content["outputs"] == {self.address2.to_string(): [1, 2, 3, {"min": 10, "max": 1000}]}
+
+        with raises(InvalidParam):
+            tx.add_input(self.address3, [1, {"min": 0, "max": 5}])
+
+    def test_assigned_token_ids_are_validated(self):
+        tx = Transaction()
+        tx.inputs = {self.address1: [1, 2]}
+        tx.outputs = {self.address2.to_string(): RangeSet([1, 2])}
+        assert tx.build_content() == b'{"inputs":{"%s":[1,2]},"outputs":{"%s":[1,2]}}' % (
+            self.address1.to_string().encode(), self.address2.to_string().encode())
+
+        with raises(InvalidParam):
+            tx.outputs = {self.address2: [1, {"min": 0, "max": 5}]}
+
+    def test_transaction_conserves_token_ids(self):
+        tx = Transaction(chain_id=self.chain_id)
+        tx.add_input(self.address1, [{"min": 0, "max": 10000000}])
+        tx.add_input(self.address2, [10000001])
+        tx.add_output(self.address3, [{"min": 0, "max": 5000000}])
+        tx.add_output(self.address1, [{"min": 5000001, "max": 10000001}])
+        tx.add_signer(self._private_fct_key1)
+        tx.add_signer(self._private_fct_key2)
+        assert tx.is_valid()
+
+        # Outputs move a token ID that isn't an input.
+        tx.add_output(self.address1, [{"min": 5000001, "max": 10000002}])
+        assert not tx.is_valid()
+
+        # Two outputs receive the same token ID.
+        tx.add_output(self.address1, [{"min": 5000000, "max": 10000001}])
+        assert not tx.is_valid()
+
+        # Two inputs send the same token ID.
+        tx.add_output(self.address1, [{"min": 5000001, "max": 10000001}])
+        tx.add_input(self.address2, [10000000, 10000001])
+        assert not tx.is_valid()
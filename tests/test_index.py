@@ -0,0 +1,84 @@
+from pytest import fixture
+from fat import FATd
+from fat.index import TokenIndex
+from fat.testing import MockFATd, SyntheticToken
+
+
+class TestTokenIndex:
+    @fixture
+    def token(self):
+        return SyntheticToken(num_addresses=20, num_transactions=300, seed=3)
+
+    @fixture
+    def server(self, token):
+        with MockFATd([token]) as server:
+            yield server
+
+    @fixture
+    def fatd(self, server):
+        return FATd(host=server.url)
+
+    def test_sync_matches_fatd(self, fatd, token):
+        index = TokenIndex(fatd, chain_id=token.chain_id, page_size=40)
+        assert index.sync() == 300
+        assert len(index) == 300
+        assert index.sync() == 0
+
+        for address in token.addresses:
+            assert index.balance(address) == token.balance(address)
+        assert index.balances() == {a: token.balance(a) for a in token.addresses if token.balance(a)}
+
+        stats = index.stats()
+        expected = token.stats()
+        for key in ("circulating", "burned", "transactions", "lasttxts"):
+            assert stats[key] == expected[key]
+
+        tx = token.transactions[42]
+        assert index.transaction(tx["entryhash"]) == tx
+        assert index.transaction("00" * 32) is None
+
+    def test_history(self, fatd, token):
+        index = TokenIndex(fatd, token_id=token.token_id, issuer_id=token.issuer_id)
+        index.sync()
+
+        address = token.addresses[0]
+        for to_from in (None, "to", "from"):
+            expected = fatd.get_all_transactions(chain_id=token.chain_id, addresses=[address], to_from=to_from)
+            assert index.history(address, to_from=to_from) == expected
+
+        history = index.history(address)
+        assert index.history(address, limit=2, offset=1) == history[1:3]
+        assert index.history(address, order="desc") == history[::-1]
+
+    def test_incremental_sync(self, fatd, token, tmp_path):
+        path = str(tmp_path / "index.db")
+        full = token.transactions
+        token.transactions = full[:120]
+
+        index = TokenIndex(fatd, path, chain_id=token.chain_id, page_size=50)
+        assert index.sync() == 120
+        index.close()
+
+        token.transactions = full
+        with TokenIndex(fatd, path, chain_id=token.chain_id, page_size=50) as index:
+            assert index.last_entry_hash == full[119]["entryhash"]
+            assert index.sync() == 180
+            assert index.last_entry_hash == full[-1]["entryhash"]
+            for address in token.addresses:
+                assert index.balance(address) == token.balance(address)
+
+    def test_fat1_counts_tokens(self):
+        token = SyntheticToken(token_type="FAT-1", num_addresses=10, num_transactions=100)
+        with MockFATd([token]) as server:
+            index = TokenIndex(FATd(host=server.url), chain_id=token.chain_id)
+            index.sync()
+            for address in token.addresses:
+                assert index.balance(address) == token.balance(address)
+            assert index.stats()["circulating"] == len(token.nf_tokens)
+
+    def test_empty_token(self):
+        token = SyntheticToken(num_transactions=0)
+        with MockFATd([token]) as server:
+            index = TokenIndex(FATd(host=server.url), chain_id=token.chain_id)
+            assert index.sync() == 0
+            assert index.stats()["transactions"] == 0
@@ -0,0 +1,31 @@
+from fat.errors import TokenSyncing
+from fat.metrics import Metrics
+
+
+class TestMetrics:
+    def test_record_and_snapshot(self):
+        metrics = Metrics()
+        metrics.record("get-balance", 0.003, 120, 80)
+        metrics.record("get-balance", 0.2, 120, 80)
+        metrics.record("get-balance", 0.004, 120, 0, TokenSyncing())
+
+        stats = metrics.snapshot()["get-balance"]
+        assert stats["count"] == 3
+        assert stats["request_bytes"] == 360
+        assert stats["response_bytes"] == 160
+        assert stats["errors"] == {"TokenSyncing": 1}
+        assert stats["latency_buckets"][0.005] == 2
+        assert stats["latency_buckets"][0.25] == 1
+        assert stats["p50"] == 0.005
+        assert stats["p99"] == 0.25
+
+    def test_dump(self):
+        metrics = Metrics()
+        metrics.record("get-stats", 0.01, 50, 500)
+        dump = metrics.dump()
+        assert 'fatd_client_latency_seconds_count{method="get-stats"} 1' in dump
+        assert 'fatd_client_latency_seconds_bucket{method="get-stats",le="+Inf"} 1' in dump
+        assert 'fatd_client_response_bytes_total{method="get-stats"} 500' in dump
+
+        metrics.reset()
+        assert metrics.snapshot() == {}
@@ -0,0 +1,93 @@
+import json
+import time
+from pytest import raises
+from requests.exceptions import ConnectionError, Timeout
+from fat.pool import FATdPool
+from tests.test_client import SyncingSession
+
+
+class DownSession:
+    def request(self, method, url, data=None, timeout=None):
+        raise ConnectionError("node is down")
+
+
+class StalledSession(SyncingSession):
+    """A node that stalls on get-sync-status until the request times out."""
+
+    def __init__(self, stall=0.3):
+        SyncingSession.__init__(self)
+        self.stall = stall
+        self.timeouts = []
+
+    def request(self, method, url, data=None, timeout=None):
+        self.timeouts.append(timeout)
+        if json.loads(data)["method"] == "get-sync-status":
+            time.sleep(self.stall)
+            raise Timeout("timed out")
+        return SyncingSession.request(self, method, url, data, timeout)
+
+
+class TestFATdPool:
+    hosts = ["http://node1:8078", "http://node2:8078", "http://node3:8078"]
+    address = "FA2gCmih3PaSYRVMt1jLkdG4Xpo2koebUpQ6FpRRnqw5FfTSN2vW"
+
+    def pool(self, heights=(100, 100, 100)):
+        pool = FATdPool(self.hosts, primary=self.hosts[1], health_interval=3600)
+        for node, height in zip(pool.nodes, heights):
+            node.client.session = SyncingSession()
+            node.client.session.height = height
+        return pool
+
+    def test_routes_reads_to_fastest_healthy_node(self):
+        pool = self.pool(heights=(100, 100, 90))
+        pool.check_health()
+        assert not pool.nodes[2].healthy
+
+        pool.nodes[0].latency, pool.nodes[1].latency = 0.5, 0.01
+        pool.get_stats(chain_id="ab")
+        assert pool.nodes[1].client.session.posts[-1]["method"] == "get-stats"
+        assert all(post["method"] != "get-stats" for post in pool.nodes[0].client.session.posts)
+
+    def test_writes_go_to_primary(self):
+        pool = self.pool()
+        pool.nodes[0].latency, pool.nodes[1].latency = 0.01, 0.5
+        pool.check_health()
+        pool.send_transaction([], "", chain_id="ab")
+        assert pool.nodes[1].client.session.posts[-1]["method"] == "send-transaction"
+
+    def test_failover(self):
+        pool = self.pool()
+        pool.check_health()
+        pool.nodes[0].latency, pool.nodes[1].latency, pool.nodes[2].latency = 0.01, 0.02, 0.03
+        pool.nodes[0].client.session = DownSession()
+        assert pool.get_stats(chain_id="ab")["result"] == {"chainid": "ab"}
+        assert not pool.nodes[0].healthy
+        assert pool.nodes[1].client.session.posts[-1]["method"] == "get-stats"
+
+        pool.nodes[1].client.session = DownSession()
+        pool.nodes[2].client.session = DownSession()
+        with raises(ConnectionError):
+            pool.get_stats(chain_id="ab")
+
+    def test_health_checks_are_bounded_and_concurrent(self):
+        pool = FATdPool(self.hosts, health_timeout=2.5)
+        for node in pool.nodes:
+            node.client.session = StalledSession()
+
+        started = time.perf_counter()
+        assert pool.check_health() == []
+        # Three 0.3 s stalls take 0.9 s one after another.
+        assert time.perf_counter() - started < 0.6
+        assert all(node.client.session.timeouts == [2.5, 2.5] for node in pool.nodes)
+        assert all(isinstance(node.last_error, Timeout) for node in pool.nodes)
+
+    def test_requests_dont_wait_for_health_checks(self):
+        pool = self.pool()
+        pool.nodes[0].client.session = StalledSession(stall=1.0)
+        pool.nodes[0].latency = 0.01
+
+        started = time.perf_counter()
+        assert pool.get_stats(chain_id="ab")["result"] == {"chainid": "ab"}
+        assert time.perf_counter() - started < 0.5
+        # The read itself keeps the client's timeout.
+        assert None in pool.nodes[0].client.session.timeouts
@@ -0,0 +1,49 @@
+from fat.errors import TokenSyncing, TransactionNotFound
+from fat.session import AdaptiveWindow, APISession, RetryPolicy
+
+
+class TestAPISession:
+    def test_pool_and_timeout(self):
+        session = APISession(pool_connections=2, pool_maxsize=64, timeout=(1, 5), keep_alive=False)
+        adapter = session.get_adapter("http://localhost:8078")
+        assert adapter._pool_maxsize == 64
+        assert session.timeout == (1, 5)
+        assert session.headers["Connection"] == "close"
+
+
+class TestRetryPolicy:
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.should_retry("get-balance", TokenSyncing(), 0)
+        assert policy.should_retry("get-balance", ConnectionError(), 1)
+        assert not policy.should_retry("get-balance", TokenSyncing(), 2)
+        assert not policy.should_retry("get-balance", TransactionNotFound(), 0)
+        assert not policy.should_retry("send-transaction", TokenSyncing(), 0)
+        assert not RetryPolicy(retry_transport_errors=False).should_retry("get-stats", ConnectionError(), 0)
+
+    def test_delay(self):
+        policy = RetryPolicy(backoff=0.5, max_backoff=3, jitter=False)
+        assert [policy.delay(attempt) for attempt in range(4)] == [0.5, 1, 2, 3]
+
+        policy = RetryPolicy(backoff=0.5, max_backoff=3)
+        assert all(0 <= policy.delay(attempt) <= 3 for attempt in range(10))
+
+
+class TestAdaptiveWindow:
+    def test_aimd(self):
+        window = AdaptiveWindow(initial=4, maximum=6)
+        for _ in range(50):
+            window.success(0.01)
+        assert window.limit == 6
+
+        window.failure()
+        assert window.limit == 3
+        for _ in range(10):
+            window.failure()
+        assert window.limit == 1
+
+        # A response much slower than usual counts as congestion.
+        window = AdaptiveWindow(initial=8)
+        window.success(0.01)
+        window.success(0.5)
+        assert window.limit == 4
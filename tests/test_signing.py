@@ -0,0 +1,86 @@
+import copy
+from factom_keys.fct import FactoidPrivateKey
+from factom_keys.serverid import ServerIDPrivateKey
+from pytest import raises
+from fat import fat0, fat1, signing
+from fat.errors import InvalidTransaction
+from fat.signing import Keyring, sign_many
+
+
+class TestSignMany:
+    def setup(self):
+        # These are throwaway private keys.
+        self.chain_id = "145d5207a1ca2978e2a1cb43c97d538cd516d65cd5d14579549664bfecd80296"
+        self.coinbase_address = "FA1zT4aFpEvcnPqPCigB3fvGu4Q4mTXY22iiuV69DqE1pNhdF2MC"
+        self.key1 = FactoidPrivateKey(key_string="Fs1fR4dMNdyp1a6qYfkLFPJZUyRg1uFW3b6NEK9VaRELD4qALstq")
+        self.key2 = FactoidPrivateKey(key_string="Fs2jSmXgaysrqiADPmAvvb71NfAa9MqvXvRemozTE8LRc64hLqtf")
+        self.address1 = self.key1.get_factoid_address()
+        self.address2 = self.key2.get_factoid_address()
+        self.issuer_key = ServerIDPrivateKey(key_string="sk12hDMpMzcm9XEdvcy77XwxYU57hpLoCMY1kHtKnyjdGWUpsAvXD")
+
+    def transactions(self, count):
+        transactions = []
+        for i in range(count):
+            tx = fat0.Transaction(chain_id=self.chain_id)
+            tx.add_input(self.address1, i + 1).add_input(self.address2, 1).add_output(self.address2, i + 2)
+            tx.add_signer(self.key1).add_signer(self.key2)
+            transactions.append(tx)
+
+        mint = fat1.Transaction(chain_id=self.chain_id)
+        mint.add_input(self.coinbase_address, [{"min": 0, "max": 99}])
+        mint.add_output(self.address1, [{"min": 0, "max": 99}])
+        mint.add_signer(self.issuer_key)
+        transactions.append(mint)
+        return transactions
+
+    def test_matches_sign(self):
+        for processes in (1, 2):
+            transactions = self.transactions(30)
+            expected = copy.deepcopy(transactions)
+            for tx in expected:
+                tx.sign()
+
+            signed = sign_many(transactions, processes=processes, chunksize=4)
+            assert signed == [(tx._ext_ids, tx._content) for tx in expected]
+            assert [tx._ext_ids for tx in transactions] == [tx._ext_ids for tx in expected]
+
+    def test_invalid_transaction(self):
+        transactions = self.transactions(2)
+        transactions[1].signers.pop()
+        with raises(InvalidTransaction):
+            sign_many(transactions)
+
+
+class TestKeyring:
+    def test_caches_signers(self):
+        key = FactoidPrivateKey(key_string="Fs1fR4dMNdyp1a6qYfkLFPJZUyRg1uFW3b6NEK9VaRELD4qALstq")
+        issuer_key = ServerIDPrivateKey(key_string="sk12hDMpMzcm9XEdvcy77XwxYU57hpLoCMY1kHtKnyjdGWUpsAvXD")
+        keyring = Keyring(maxsize=2)
+
+        signer = keyring.signer(key)
+        assert signer.rcd == b"\x01" + key.get_factoid_address().key_bytes
+        assert keyring.signer(FactoidPrivateKey(key_string=key.to_string())) is signer
+        assert keyring.signer(issuer_key).rcd == b"\x01" + issuer_key.get_public_key().key_bytes
+        assert len(keyring) == 2
+        keyring.clear()
+        assert len(keyring) == 0
+
+    def test_sign_with_keyring(self):
+        key = FactoidPrivateKey(key_string="Fs1fR4dMNdyp1a6qYfkLFPJZUyRg1uFW3b6NEK9VaRELD4qALstq")
+        address = key.get_factoid_address()
+        chain_id = "145d5207a1ca2978e2a1cb43c97d538cd516d65cd5d14579549664bfecd80296"
+        signing.keyring.clear()
+
+        own = Keyring()
+        tx = fat0.Transaction(inputs={address: 1}, outputs={address: 1}, chain_id=chain_id, signers=[key])
+        tx.sign(keyring=own)
+        assert len(own) == 1 and len(signing.keyring) == 0
+        ext_ids = tx._ext_ids
+
+        tx.sign(keyring=None)
+        assert tx._ext_ids == ext_ids
+        assert len(signing.keyring) == 0
+
+        sign_many([tx], processes=1, keyring=None)
+        assert tx._ext_ids == ext_ids
+        assert len(signing.keyring) == 0
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+from fat.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_coalesced(self):
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.1)
+            return "result"
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("key", fn))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ["result"] * 8
+        assert flight.coalesced == 7
+
+        # Once the call is complete, the next one goes through.
+        flight.do("key", fn)
+        assert len(calls) == 2
+
+    def test_errors_shared(self):
+        flight = SingleFlight()
+        errors = []
+
+        def fn():
+            time.sleep(0.1)
+            raise ValueError("failed")
+
+        def call():
+            try:
+                flight.do("key", fn)
+            except ValueError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 4
+        assert len(set(map(id, errors))) == 1
+
+
+class TestAsyncSingleFlight:
+    def test_concurrent_calls_coalesced(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def fail():
+            await asyncio.sleep(0.05)
+            raise ValueError("failed")
+
+        async def main():
+            results = await asyncio.gather(*[flight.do("key", fn) for _ in range(8)])
+            assert results == ["result"] * 8
+            errors = await asyncio.gather(*[flight.do("other", fail) for _ in range(2)], return_exceptions=True)
+            assert all(isinstance(error, ValueError) for error in errors)
+
+        asyncio.run(main())
+        assert len(calls) == 1
+        assert flight.coalesced == 8
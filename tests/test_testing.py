@@ -0,0 +1,80 @@
+from pytest import fixture, raises
+from fat import FATd
+from fat.errors import TokenSyncing, TransactionNotFound
+from fat.testing import MockFATd, SyntheticToken
+
+
+class TestMockFATd:
+    @fixture(scope="class")
+    def server(self):
+        tokens = [
+            SyntheticToken(num_addresses=20, num_transactions=120),
+            SyntheticToken(token_id="nft", token_type="FAT-1", num_addresses=5, num_transactions=50, seed=1),
+        ]
+        with MockFATd(tokens) as server:
+            yield server
+
+    @fixture
+    def fat0(self, server):
+        return list(server.tokens.values())[0]
+
+    @fixture
+    def fat1(self, server):
+        return list(server.tokens.values())[1]
+
+    @fixture
+    def fatd(self, server):
+        return FATd(host=server.url)
+
+    def test_synthetic_balances_match_history(self, fat0):
+        balances = {}
+        for tx in fat0.transactions:
+            for address, amount in tx["data"]["inputs"].items():
+                balances[address] = balances.get(address, 0) - amount
+            for address, amount in tx["data"]["outputs"].items():
+                balances[address] = balances.get(address, 0) + amount
+        for address in fat0.addresses:
+            assert balances.get(address, 0) == fat0.balance(address) >= 0
+
+    def test_token_queries(self, fatd, fat0):
+        assert fatd.get_issuance(chain_id=fat0.chain_id)["result"]["tokenid"] == fat0.token_id
+        issuance = fatd.get_issuance(token_id=fat0.token_id, issuer_id=fat0.issuer_id)
+        assert issuance["result"]["chainid"] == fat0.chain_id
+        assert fatd.get_stats(chain_id=fat0.chain_id)["result"]["transactions"] == 120
+
+        address = fat0.addresses[0]
+        assert fatd.get_balance(address, chain_id=fat0.chain_id)["result"] == fat0.balance(address)
+
+        tx = fat0.transactions[7]
+        assert fatd.get_transaction(tx["entryhash"], chain_id=fat0.chain_id)["result"] == tx
+        with raises(TransactionNotFound):
+            fatd.get_transaction("00" * 32, chain_id=fat0.chain_id)
+
+    def test_transaction_pages(self, fatd, fat0):
+        assert fatd.get_all_transactions(chain_id=fat0.chain_id, limit=25, workers=3) == fat0.transactions
+
+        newest = fatd.get_transactions(chain_id=fat0.chain_id, order="desc", limit=1)["result"]
+        assert newest == fat0.transactions[-1:]
+
+        address = fat0.addresses[0]
+        history = list(fatd.iter_transactions(chain_id=fat0.chain_id, addresses=[address]))
+        assert history
+        assert all(address in tx["data"]["inputs"] or address in tx["data"]["outputs"] for tx in history)
+
+    def test_nf_tokens(self, fatd, fat1):
+        tokens = list(fatd.iter_nf_tokens(chain_id=fat1.chain_id, limit=7))
+        assert len(tokens) == len(fat1.nf_tokens)
+        owner = tokens[0]["owner"]
+        assert tokens[0]["id"] in fatd.get_nf_balance(owner, chain_id=fat1.chain_id)["result"]
+        assert fatd.get_nf_token(tokens[0]["id"], chain_id=fat1.chain_id)["result"] == tokens[0]
+
+    def test_daemon_methods(self, fatd, server):
+        assert len(fatd.get_daemon_tokens()["result"]) == 2
+        assert fatd.get_sync_status()["result"]["syncheight"] == server.sync_height
+        assert fatd.get_daemon_properties()["result"]["fatdversion"] == "mock"
+
+    def test_injected_errors(self, fat0):
+        with MockFATd([fat0], error_rate=1.0) as server:
+            fatd = FATd(host=server.url)
+            with raises(TokenSyncing):
+                fatd.get_stats(chain_id=fat0.chain_id)